@@ -1,111 +1,160 @@
 import os
 import time
+import asyncio
 import random
 import logging
 import signal
 import sys
-import json
+import threading
+import argparse
+import atexit
+import fcntl
+from collections import deque
+from importlib.metadata import version, PackageNotFoundError
 from datetime import datetime, timedelta
 
+from utils.logging_utils import configure_logging
+
 # Configure logging first
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('twitter_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging('twitter_bot.log')
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Diagnostic Information
-logger.info("=== Startup Diagnostics ===")
-logger.info("Python Version: %s", sys.version)
-logger.info("Python Executable: %s", sys.executable)
-logger.info("Python Path: %s", os.pathsep.join(sys.path))
-logger.info("Working Directory: %s", os.getcwd())
-logger.info("Script Location: %s", os.path.abspath(__file__))
-
-# Virtual Environment Check
-venv_path = os.environ.get('VIRTUAL_ENV')
-logger.info("Virtual Environment: %s", venv_path if venv_path else "Not activated")
-
-# Directory Structure Check
-expected_dirs = ['platforms', 'utils']
-for dir_name in expected_dirs:
-    dir_path = os.path.join(os.path.dirname(__file__), dir_name)
-    logger.info("Directory '%s' exists: %s", dir_name, os.path.exists(dir_path))
-
-# Test env file loading
-try:
-    from dotenv import load_dotenv
-    logger.info("Attempting to load .env file...")
-    env_path = os.path.join(os.path.dirname(__file__), '.env')
-    logger.info(".env file exists: %s", os.path.exists(env_path))
-    load_dotenv()
-    logger.info("Environment after load_dotenv:")
+def log_startup_diagnostics():
+    """Log interpreter, environment and dependency diagnostics"""
+    logger.info("=== Startup Diagnostics ===")
+    logger.info("Python Version: %s", sys.version)
+    logger.info("Python Executable: %s", sys.executable)
+    logger.info("Python Path: %s", os.pathsep.join(sys.path))
+    logger.info("Working Directory: %s", os.getcwd())
+    logger.info("Script Location: %s", os.path.abspath(__file__))
+
+    # Virtual Environment Check
+    venv_path = os.environ.get('VIRTUAL_ENV')
+    logger.info("Virtual Environment: %s", venv_path if venv_path else "Not activated")
+
+    # Directory Structure Check
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for dir_name in ['platforms', 'utils']:
+        logger.info("Directory '%s' exists: %s", dir_name, os.path.isdir(os.path.join(base_dir, dir_name)))
+
+    # Environment check
+    logger.info(".env file exists: %s", os.path.exists(os.path.join(base_dir, '.env')))
     logger.info("TWITTER_USERNAME present: %s", bool(os.getenv('TWITTER_USERNAME')))
     logger.info("TWITTER_PASSWORD present: %s", bool(os.getenv('TWITTER_PASSWORD')))
     logger.info("TWITTER_EMAIL present: %s", bool(os.getenv('TWITTER_EMAIL')))
-except Exception as e:
-    logger.error("Error loading .env: %s", str(e))
 
-# Test dependency availability and versions
+    # Test dependency availability and versions
+    try:
+        logger.info("=== Dependency Check ===")
+        # Read versions from installed distribution metadata rather than importing each package
+        packages_to_check = ['selenium', 'webdriver-manager', 'psutil', 'openai', 'python-dotenv']
+        for package in packages_to_check:
+            try:
+                logger.info("✓ %s is available (version: %s)", package, version(package))
+            except PackageNotFoundError:
+                logger.error("✗ %s is missing", package)
+    except Exception as e:
+        logger.error("Error checking packages: %s", str(e))
+
+    logger.info("=== End Startup Diagnostics ===")
+
+# Load environment variables
 try:
-    logger.info("=== Dependency Check ===")
-    packages_to_check = ['selenium', 'webdriver_manager', 'psutil', 'openai', 'python-dotenv']
-    for package in packages_to_check:
-        try:
-            module = __import__(package)
-            version = getattr(module, '__version__', 'unknown')
-            logger.info(f"✓ {package} is available (version: {version})")
-        except ImportError as e:
-            logger.error(f"✗ {package} is missing: {str(e)}")
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
 except Exception as e:
-    logger.error("Error checking packages: %s", str(e))
-
-logger.info("=== End Startup Diagnostics ===")
+    logger.error("Error loading .env: %s", str(e))
 
 # Continue with the rest of the original imports
 try:
     from platforms.twitter.handler import TwitterHandler
     from utils.personality_manager import PersonalityManager
+    from utils.json_utils import load_json, write_json
 except Exception as e:
     logger.error("Error importing project modules: %s", str(e))
 
+# Attempts, and seconds between them, to lock the PID file
+PID_LOCK_ATTEMPTS = 5
+PID_LOCK_RETRY_DELAY = 0.025
+
 class ContinuousTwitterBot:
     def __init__(self):
-        self.running = True
+        self.pid_file = 'bot.pid'
+        self._acquire_pid_file()
+
+        self._stop = threading.Event()
+        self._shutdown_count = 0
         self.personality_manager = PersonalityManager()
         self.twitter_handler = None
-        self.last_tweet_time = None
+        self.last_tweet_time = None  # Wall-clock time, persisted in the status file
+        self._last_tweet_monotonic = None
+        self._next_tweet_deadline = None  # time.monotonic() value when the next tweet is due
         self.status_file = 'bot_status.json'
+        self._wake_event = None
+        self._reload_requested = False
+        
+        self._delay_schedule = deque()
         
         # Load config
         self.config = self._load_config()
+        self._apply_config()
+        
+        # Load or create status file
+        self.load_status()
+        self._schedule_next_tweet()
+
+    def _acquire_pid_file(self):
+        """Write our PID to the PID file and hold an exclusive lock on it"""
+        fd = os.open(self.pid_file, os.O_RDWR | os.O_CREAT, 0o644)
+        # manage_bot briefly takes a shared lock to probe the file, so retry
+        # for about 100ms before deciding another instance holds it
+        for attempt in range(PID_LOCK_ATTEMPTS):
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if attempt == PID_LOCK_ATTEMPTS - 1:
+                    os.close(fd)
+                    raise RuntimeError(f"Another bot instance holds {self.pid_file}")
+                time.sleep(PID_LOCK_RETRY_DELAY)
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        # Keep the descriptor open so the lock lives as long as the process
+        self._pid_fd = fd
+        atexit.register(self._release_pid_file)
+
+    def _release_pid_file(self):
+        """Remove the PID file and release its lock"""
+        if self._pid_fd is None:
+            return
+        try:
+            os.unlink(self.pid_file)
+        except FileNotFoundError:
+            pass
+        os.close(self._pid_fd)
+        self._pid_fd = None
+
+    def _apply_config(self):
+        """Resolve the settings used by the main loop from the loaded config"""
+        twitter_config = self.config['platforms']['twitter']
         
         # Set rate limits from config
-        self.tweets_per_hour = self.config['platforms']['twitter']['rate_limits']['tweets_per_hour']
-        self.min_delay = self.config['platforms']['twitter']['rate_limits']['min_delay_between_actions']
+        self.tweets_per_hour = twitter_config['rate_limits']['tweets_per_hour']
+        self.min_delay = twitter_config['rate_limits']['min_delay_between_actions']
+        self.reply_probability = twitter_config['personality']['settings']['reply_probability']
         
         # Calculate intervals based on rate limits
         self.min_interval = max(3600 // self.tweets_per_hour, self.min_delay)  # Ensure we don't exceed tweets_per_hour
         self.max_interval = self.min_interval * 2  # Double the min interval for max
-        
-        # Load or create status file
-        self.load_status()
-        
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self.handle_shutdown)
-        signal.signal(signal.SIGTERM, self.handle_shutdown)
+        self._delay_schedule.clear()
 
     def _load_config(self, config_path: str = "config.json") -> dict:
         """Load configuration from file"""
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            config = load_json(config_path)
             logger.info("Successfully loaded config")
             return config
         except Exception as e:
@@ -116,11 +165,10 @@ class ContinuousTwitterBot:
         """Load bot status from file"""
         try:
             if os.path.exists(self.status_file):
-                with open(self.status_file, 'r') as f:
-                    status = json.load(f)
-                    last_tweet = status.get('last_tweet_time')
-                    if last_tweet:
-                        self.last_tweet_time = datetime.fromisoformat(last_tweet)
+                status = load_json(self.status_file)
+                last_tweet = status.get('last_tweet_time')
+                if last_tweet:
+                    self.last_tweet_time = datetime.fromisoformat(last_tweet)
         except Exception as e:
             logger.error(f"Error loading status: {str(e)}")
 
@@ -135,27 +183,69 @@ class ContinuousTwitterBot:
                 'current_min_interval': self.min_interval,
                 'current_max_interval': self.max_interval
             }
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f)
+            write_json(self.status_file, status)
         except Exception as e:
             logger.error(f"Error saving status: {str(e)}")
 
-    def handle_shutdown(self, signum, frame):
-        """Handle shutdown signals gracefully"""
-        logger.info("Received shutdown signal. Cleaning up...")
-        self.running = False
+    @property
+    def running(self) -> bool:
+        """Whether the bot has not been asked to shut down"""
+        return not self._stop.is_set()
+
+    def handle_shutdown(self):
+        """Handle shutdown signals by flagging the loops to stop at the next safe point.
+
+        A second signal exits immediately, for when a hung browser call keeps
+        the graceful path from finishing.
+        """
+        self._shutdown_count += 1
+        if self._shutdown_count >= 2:
+            logger.warning("Received second shutdown signal. Exiting immediately")
+            os._exit(130)
+        logger.info("Received shutdown signal. Finishing current work...")
+        self._stop.set()
+        if self._wake_event:
+            self._wake_event.set()
+
+    def handle_reload(self):
+        """Handle SIGHUP by requesting a config reload at the next loop iteration"""
+        logger.info("Received reload signal")
+        self._reload_requested = True
+        if self._wake_event:
+            self._wake_event.set()
+
+    def _reload_config(self):
+        """Reload config.json and recompute intervals, keeping the Twitter session"""
+        self._reload_requested = False
+        try:
+            self.config = self._load_config()
+            self._apply_config()
+            if self.twitter_handler:
+                self.twitter_handler.apply_config(self.config)
+            self._schedule_next_tweet()
+            logger.info(f"Reloaded config: {self.tweets_per_hour} tweets/hour, {self.min_delay}s min delay "
+                        "(headless, profile_dir and kill_existing_chrome apply from the next browser restart)")
+        except Exception as e:
+            logger.error(f"Failed to reload config, keeping previous settings: {str(e)}")
+
+    def _cleanup(self):
+        """Persist status and release the Twitter handler"""
         self.save_status()
         if self.twitter_handler:
             logger.info("Closing Twitter handler...")
-            del self.twitter_handler
+            self._close_twitter_handler()
         logger.info("Shutdown complete")
-        sys.exit(0)
+
+    def _close_twitter_handler(self):
+        """Quit the current handler's browser session and drop the handler"""
+        handler, self.twitter_handler = self.twitter_handler, None
+        if handler:
+            handler.close()
 
     def initialize_twitter_handler(self):
         """Initialize or reinitialize the Twitter handler with error handling"""
         try:
-            if self.twitter_handler:
-                del self.twitter_handler
+            self._close_twitter_handler()
             
             logger.info("Initializing Twitter handler...")
             self.twitter_handler = TwitterHandler(self.personality_manager)
@@ -165,19 +255,34 @@ class ContinuousTwitterBot:
             logger.error(f"Failed to initialize Twitter handler: {str(e)}")
             return False
 
+    def _refill_delay_schedule(self, size: int = 64):
+        """Pre-draw a batch of randomized tweet delays"""
+        half_delay = self.min_delay / 2
+        for _ in range(size):
+            base_delay = random.randint(self.min_interval, self.max_interval)
+            jitter = random.uniform(-half_delay, half_delay)  # Add jitter within min_delay bounds
+            self._delay_schedule.append(max(self.min_interval, base_delay + jitter))
+
     def get_next_tweet_delay(self):
-        """Calculate delay until next tweet with some randomness"""
-        base_delay = random.randint(self.min_interval, self.max_interval)
-        jitter = random.uniform(-self.min_delay/2, self.min_delay/2)  # Add jitter within min_delay bounds
-        return max(self.min_interval, base_delay + jitter)
+        """Get the delay until the next tweet from the pre-drawn schedule"""
+        if not self._delay_schedule:
+            self._refill_delay_schedule()
+        return self._delay_schedule.popleft()
+
+    def _schedule_next_tweet(self):
+        """Compute the deadline of the next tweet once from the last tweet time"""
+        if not self.last_tweet_time:
+            self._next_tweet_deadline = None
+            return
+        if self._last_tweet_monotonic is None:
+            # Last tweet restored from the status file; translate it to the monotonic clock once
+            elapsed = (datetime.now() - self.last_tweet_time).total_seconds()
+            self._last_tweet_monotonic = time.monotonic() - elapsed
+        self._next_tweet_deadline = self._last_tweet_monotonic + self.get_next_tweet_delay()
 
     def should_post_tweet(self):
         """Determine if it's time to post a new tweet"""
-        if not self.last_tweet_time:
-            return True
-        
-        elapsed = (datetime.now() - self.last_tweet_time).total_seconds()
-        return elapsed >= self.get_next_tweet_delay()
+        return self._next_tweet_deadline is None or time.monotonic() >= self._next_tweet_deadline
 
     def get_stats(self):
         """Get bot statistics"""
@@ -194,93 +299,145 @@ class ContinuousTwitterBot:
             stats.update(twitter_stats)
         return stats
 
-    def run(self):
+    async def _sleep(self, seconds: float):
+        """Sleep for the given time, waking early on shutdown or reload"""
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=max(0, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    def _wait_before_retry(self, attempt_started: float, retries: int, max_retries: int):
+        """Wait out the rest of min_delay, counting time spent in the failed attempt"""
+        remaining = max(0.0, self.min_delay - (time.monotonic() - attempt_started))
+        logger.warning(f"Retry {retries}/{max_retries} after {remaining:.0f} seconds...")
+        self._stop.wait(remaining)
+
+    def _post_cycle(self):
+        """Generate and post a tweet, retrying on failure"""
+        max_retries = 3
+        retries = 0
+        success = False
+
+        while retries < max_retries and not success and self.running:
+            attempt_started = time.monotonic()
+            try:
+                # Get active personality
+                personality = self.twitter_handler.active_personality
+                logger.info(f"Using personality: {personality['name']}")
+
+                # Generate and post tweet
+                tweet_content = self.twitter_handler.generate_tweet_content(
+                    personality=personality,
+                    context="Latest developments in AI, DeFi, and blockchain technology"
+                )
+
+                if tweet_content:
+                    tweet_id = self.twitter_handler.post_tweet(tweet_content, personality)
+                    if tweet_id:
+                        logger.info(f"Successfully posted tweet with ID: {tweet_id}")
+                        self.last_tweet_time = datetime.now()
+                        self._last_tweet_monotonic = time.monotonic()
+                        self._schedule_next_tweet()
+                        self.save_status()
+                        success = True
+
+                        # Wait briefly before potential follow-up
+                        self._stop.wait(random.uniform(self.min_delay, self.min_delay * 2))
+
+                        # Check reply probability from config
+                        if random.random() < self.reply_probability and self.running:
+                            follow_up = self.twitter_handler.generate_reply_content(
+                                personality=personality,
+                                tweet_content=tweet_content
+                            )
+                            if follow_up:
+                                reply_id = self.twitter_handler.reply_to_tweet(
+                                    tweet_id=tweet_id,
+                                    content=follow_up,
+                                    personality=personality
+                                )
+                                if reply_id:
+                                    logger.info(f"Posted follow-up tweet with ID: {reply_id}")
+
+                if not success:
+                    retries += 1
+                    if retries < max_retries:
+                        self._wait_before_retry(attempt_started, retries, max_retries)
+            except Exception as e:
+                logger.error(f"Error during tweet posting: {str(e)}")
+                retries += 1
+                if retries < max_retries:
+                    self._wait_before_retry(attempt_started, retries, max_retries)
+                else:
+                    logger.error("Max retries reached. Reinitializing Twitter handler...")
+                    self._close_twitter_handler()
+
+    async def _main(self):
         """Main loop for continuous operation"""
         retry_delay = 300  # 5 minutes between retries on failure
-        max_retries = 3
-        
+
+        # Set up signal handlers for graceful shutdown
+        self._wake_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self.handle_shutdown)
+        loop.add_signal_handler(signal.SIGTERM, self.handle_shutdown)
+        loop.add_signal_handler(signal.SIGHUP, self.handle_reload)
+
         logger.info("Starting continuous Twitter bot...")
         logger.info(f"Rate limits: {self.tweets_per_hour} tweets/hour, {self.min_delay}s min delay")
         logger.info(f"Posting interval: {self.min_interval/3600:.1f}-{self.max_interval/3600:.1f} hours")
-        
-        while self.running:
-            try:
-                # Initialize handler if needed
-                if not self.twitter_handler:
-                    if not self.initialize_twitter_handler():
-                        logger.error("Failed to initialize Twitter handler. Retrying in 5 minutes...")
-                        time.sleep(retry_delay)
+
+        try:
+            while self.running:
+                try:
+                    if self._reload_requested:
+                        self._wake_event.clear()
+                        self._reload_config()
+
+                    # Initialize handler if needed
+                    if not self.twitter_handler:
+                        if not await asyncio.to_thread(self.initialize_twitter_handler):
+                            logger.error("Failed to initialize Twitter handler. Retrying in 5 minutes...")
+                            await self._sleep(retry_delay)
+                            continue
+
+                    # Park until the next tweet is due
+                    if not self.should_post_tweet():
+                        wait_time = self._next_tweet_deadline - time.monotonic()
+                        logger.debug(f"Sleeping for {wait_time:.0f} seconds until next tweet...")
+                        await self._sleep(wait_time)
                         continue
 
-                # Check if it's time to post
-                if self.should_post_tweet():
-                    retries = 0
-                    success = False
-                    
-                    while retries < max_retries and not success and self.running:
-                        try:
-                            # Get active personality
-                            personality = self.twitter_handler.active_personality
-                            logger.info(f"Using personality: {personality['name']}")
-                            
-                            # Generate and post tweet
-                            tweet_content = self.twitter_handler.generate_tweet_content(
-                                personality=personality,
-                                context="Latest developments in AI, DeFi, and blockchain technology"
-                            )
-                            
-                            if tweet_content:
-                                tweet_id = self.twitter_handler.post_tweet(tweet_content, personality)
-                                if tweet_id:
-                                    logger.info(f"Successfully posted tweet with ID: {tweet_id}")
-                                    self.last_tweet_time = datetime.now()
-                                    self.save_status()
-                                    success = True
-                                    
-                                    # Wait briefly before potential follow-up
-                                    time.sleep(random.uniform(self.min_delay, self.min_delay * 2))
-                                    
-                                    # Check reply probability from config
-                                    reply_prob = self.config['platforms']['twitter']['personality']['settings']['reply_probability']
-                                    if random.random() < reply_prob and self.running:
-                                        follow_up = self.twitter_handler.generate_reply_content(
-                                            personality=personality,
-                                            tweet_content=tweet_content
-                                        )
-                                        if follow_up:
-                                            reply_id = self.twitter_handler.reply_to_tweet(
-                                                tweet_id=tweet_id,
-                                                content=follow_up,
-                                                personality=personality
-                                            )
-                                            if reply_id:
-                                                logger.info(f"Posted follow-up tweet with ID: {reply_id}")
-                            
-                            if not success:
-                                retries += 1
-                                if retries < max_retries:
-                                    logger.warning(f"Retry {retries}/{max_retries} after {self.min_delay} seconds...")
-                                    time.sleep(self.min_delay)
-                        except Exception as e:
-                            logger.error(f"Error during tweet posting: {str(e)}")
-                            retries += 1
-                            if retries < max_retries:
-                                logger.warning(f"Retry {retries}/{max_retries} after {self.min_delay} seconds...")
-                                time.sleep(self.min_delay)
-                            else:
-                                logger.error("Max retries reached. Reinitializing Twitter handler...")
-                                self.twitter_handler = None
-                
-                # Sleep before next check
-                sleep_time = min(300, self.min_delay)  # Check at least every 5 minutes or min_delay
-                logger.debug(f"Sleeping for {sleep_time} seconds...")
-                time.sleep(sleep_time)
-                
-            except Exception as e:
-                logger.error(f"Unexpected error in main loop: {str(e)}")
-                logger.info(f"Sleeping for {retry_delay} seconds before retry...")
-                time.sleep(retry_delay)
+                    await asyncio.to_thread(self._post_cycle)
+
+                    # Back off before trying again if the cycle did not post
+                    if self.running and self.should_post_tweet():
+                        await self._sleep(self.min_delay)
+
+                except Exception as e:
+                    logger.error(f"Unexpected error in main loop: {str(e)}")
+                    logger.info(f"Sleeping for {retry_delay} seconds before retry...")
+                    await self._sleep(retry_delay)
+        finally:
+            # Off the loop thread, so a second signal is still dispatched while
+            # a hung browser keeps close() from returning
+            await asyncio.to_thread(self._cleanup)
+
+    def run(self):
+        """Run the bot until a shutdown signal is received"""
+        asyncio.run(self._main())
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='FlavumHive Twitter Bot')
+    parser.add_argument('--debug', action='store_true',
+                      help='Enable debug logging and startup diagnostics')
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    # BOT_DIAG also enables diagnostics when started via manage_bot, which passes no flags
+    if args.debug or os.getenv('BOT_DIAG'):
+        log_startup_diagnostics()
+
     bot = ContinuousTwitterBot()
     bot.run() 
\ No newline at end of file
@@ -1,49 +1,43 @@
-import json
-import time
-import threading
+import asyncio
+import signal
 import os
 import sys
 import argparse
 from datetime import datetime
+from functools import partial
 import logging
 from typing import Dict, List
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 
 from utils.db_init import initialize_database as init_database
 from utils.post import generate_posts
 from utils.comment import generate_comments
 from utils.personality_manager import PersonalityManager
+from utils.logging_utils import configure_logging
+from utils.json_utils import load_json
 from platforms.reddit.handler import RedditHandler
 from platforms.eliza.handler import ElizaHandler
 
-# Configure logging first
-logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for more detail
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Logging is configured in main() once the platform, and so the log file, is known
 logger = logging.getLogger(__name__)
 
 # Load environment variables
-logger.info("Loading environment variables...")
-env_path = find_dotenv()
-logger.info(f"Found .env file at: {env_path}")
+env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 load_dotenv(env_path)
 
-# Log all relevant environment variables (without sensitive data)
-logger.info("Environment variable presence check:")
-for var in ['DB_PATH', 'REDDIT_CLIENT_ID', 'REDDIT_USERNAME', 'OPENAI_API_KEY']:
-    logger.info(f"{var} present: {bool(os.getenv(var))}")
-
 # Set up database path
 DB_PATH = os.getenv("DB_PATH", "bot.db")
-logger.info(f"Using database path: {DB_PATH}")
-logger.info(f"Database file exists: {os.path.exists(DB_PATH)}")
-if os.path.exists(DB_PATH):
-    logger.info(f"Database file permissions: {oct(os.stat(DB_PATH).st_mode)[-3:]}")
+
+def log_startup_diagnostics():
+    """Log environment and database diagnostics"""
+    # Log all relevant environment variables (without sensitive data)
+    logger.debug("Environment variable presence check:")
+    for var in ['DB_PATH', 'REDDIT_CLIENT_ID', 'REDDIT_USERNAME', 'OPENAI_API_KEY']:
+        logger.debug(f"{var} present: {bool(os.getenv(var))}")
+
+    logger.debug(f"Database file exists: {os.path.exists(DB_PATH)}")
+    if os.path.exists(DB_PATH):
+        logger.debug(f"Database file permissions: {oct(os.stat(DB_PATH).st_mode)[-3:]}")
 
 class MultiPlatformBot:
     def __init__(self, config_path: str = "config.json"):
@@ -55,8 +49,7 @@ class MultiPlatformBot:
         
         # Load configuration
         try:
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
+            self.config = load_json(config_path)
             logger.info("Configuration loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load configuration: {str(e)}")
@@ -68,11 +61,15 @@ class MultiPlatformBot:
             logger.info("Personality manager initialized")
             
             self.platform_handlers = {}
+            # Per-platform unit of work, bound once with its arguments
+            self._tick = {}
             self.initialize_platforms()
             logger.info(f"Initialized platforms: {list(self.platform_handlers.keys())}")
             
             # Flag to control the bot's running state
             self.running = True
+            self._loop = None
+            self._shutdown_event = None
             
         except Exception as e:
             logger.error(f"Failed to initialize components: {str(e)}")
@@ -82,7 +79,10 @@ class MultiPlatformBot:
         """Initialize enabled platform handlers"""
         if self.config['platforms'].get('reddit', {}).get('enabled', False):
             try:
-                self.platform_handlers['reddit'] = RedditHandler(self.personality_manager)
+                handler = RedditHandler(self.personality_manager)
+                self.platform_handlers['reddit'] = handler
+                commenters_config = self.config['platforms']['reddit'].get('commenters', {})
+                self._tick['reddit'] = partial(handler.process_subreddits, commenters_config)
                 logger.info("Reddit platform initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Reddit platform: {str(e)}")
@@ -90,13 +90,22 @@ class MultiPlatformBot:
 
         if self.config['platforms'].get('eliza', {}).get('enabled', False):
             try:
-                self.platform_handlers['eliza'] = ElizaHandler()
+                handler = ElizaHandler()
+                self.platform_handlers['eliza'] = handler
+                self._tick['eliza'] = handler.cleanup_inactive_sessions
                 logger.info("Eliza platform initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Eliza platform: {str(e)}")
                 raise
 
-    def run_platform(self, platform_name: str):
+    async def _sleep(self, seconds: float):
+        """Sleep for the given time, waking early on shutdown"""
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_platform(self, platform_name: str):
         """Run a specific platform's main loop"""
         handler = self.platform_handlers.get(platform_name)
         if not handler:
@@ -104,93 +113,90 @@ class MultiPlatformBot:
             return
 
         logger.info(f"Starting {platform_name} platform loop")
+
+        tick = self._tick[platform_name]
+        # Get platform-specific rate limits
+        rate_limits = self.config['platforms'][platform_name].get('rate_limits', {})
+        delay = rate_limits.get('min_delay_between_actions', 30)
         
         while self.running:
-            try:
-                if platform_name == 'reddit':
-                    # Get Reddit-specific config
-                    reddit_config = self.config['platforms']['reddit']
-                    commenters_config = reddit_config.get('commenters', {})
-                    
-                    # Process subreddits with commenter configuration
-                    handler.process_subreddits(commenters_config)
-                elif platform_name == 'eliza':
-                    handler.cleanup_inactive_sessions()
-                
-                # Get platform-specific rate limits
-                rate_limits = self.config['platforms'][platform_name].get('rate_limits', {})
-                delay = rate_limits.get('min_delay_between_actions', 30)
-                
-                # Sleep for the configured delay
-                time.sleep(delay)
+            await asyncio.to_thread(tick)
+            
+            # Sleep for the configured delay
+            await self._sleep(delay)
 
+    async def _supervise_platform(self, platform_name: str):
+        """Run a platform loop, restarting it after unexpected errors"""
+        while self.running:
+            try:
+                await self.run_platform(platform_name)
+                return
             except Exception as e:
                 logger.error(f"Error in {platform_name} platform loop: {str(e)}")
                 if self.running:  # Only sleep if we're still meant to be running
-                    time.sleep(60)  # Wait a minute before retrying
+                    await self._sleep(60)  # Wait a minute before retrying
+
+    async def _main(self):
+        """Run all enabled platforms as tasks of one task group"""
+        self._loop = asyncio.get_running_loop()
+        self._shutdown_event = asyncio.Event()
+        self._loop.add_signal_handler(signal.SIGINT, self.stop)
+        self._loop.add_signal_handler(signal.SIGTERM, self.stop)
+
+        async with asyncio.TaskGroup() as task_group:
+            for platform_name in self.platform_handlers.keys():
+                task_group.create_task(
+                    self._supervise_platform(platform_name),
+                    name=f"{platform_name}_task"
+                )
+                logger.info(f"Started {platform_name} platform task")
+
+        for handler in self.platform_handlers.values():
+            if hasattr(handler, 'close'):
+                handler.close()
+        logger.info("Bot shutdown complete")
 
     def start(self):
-        """Start all enabled platforms in separate threads"""
-        threads = []
-        
-        for platform_name in self.platform_handlers.keys():
-            thread = threading.Thread(
-                target=self.run_platform,
-                args=(platform_name,),
-                name=f"{platform_name}_thread"
-            )
-            thread.daemon = True  # Make thread daemon so it exits when main thread exits
-            thread.start()
-            threads.append(thread)
-            logger.info(f"Started {platform_name} platform thread")
-
-        try:
-            # Keep the main thread alive and handle keyboard interrupt
-            while True:
-                # Check if all threads are alive
-                for thread in threads:
-                    if not thread.is_alive():
-                        logger.error(f"Thread {thread.name} died unexpectedly")
-                        # Restart the thread if it died
-                        if self.running:
-                            new_thread = threading.Thread(
-                                target=self.run_platform,
-                                args=(thread.name.replace('_thread', ''),),
-                                name=thread.name
-                            )
-                            new_thread.daemon = True
-                            new_thread.start()
-                            threads.remove(thread)
-                            threads.append(new_thread)
-                            logger.info(f"Restarted {thread.name}")
-                time.sleep(60)
-        except KeyboardInterrupt:
-            logger.info("Received shutdown signal")
-            self.running = False  # Signal threads to stop
-            logger.info("Waiting for threads to finish...")
-            # Wait for threads to finish their current iteration
-            for thread in threads:
-                thread.join(timeout=10)
-            logger.info("Bot shutdown complete")
+        """Start all enabled platforms and run until a shutdown signal"""
+        asyncio.run(self._main())
 
     def stop(self):
         """Stop the bot gracefully"""
+        if self.running:
+            logger.info("Received shutdown signal")
         self.running = False
+        if self._loop and self._shutdown_event:
+            self._loop.call_soon_threadsafe(self._shutdown_event.set)
 
 def main():
     parser = argparse.ArgumentParser(description='FlavumHive Social Media Bot')
     parser.add_argument('--platform', type=str, required=True, choices=['reddit', 'twitter'],
                       help='Platform to run the bot on')
+    parser.add_argument('--debug', action='store_true',
+                      help='Enable debug logging and startup diagnostics')
     args = parser.parse_args()
 
+    # Only the first configure_logging call takes effect, so choose the file here
+    # rather than leaving it to whichever entrypoint module is imported first
+    configure_logging('twitter_bot.log' if args.platform == 'twitter' else 'bot.log')
+    logger.info(f"Using .env file at: {env_path}")
+    logger.info(f"Using database path: {DB_PATH}")
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+        log_startup_diagnostics()
+
     try:
-        bot = MultiPlatformBot()
         if args.platform == 'reddit':
+            bot = MultiPlatformBot()
             logger.info("Starting Reddit bot...")
             bot.start()  # This will run until interrupted
-        else:
-            logger.error(f"Platform {args.platform} not yet implemented")
-            sys.exit(1)
+        elif args.platform == 'twitter':
+            from continuous_twitter_bot import ContinuousTwitterBot, log_startup_diagnostics as log_twitter_diagnostics
+            if args.debug:
+                log_twitter_diagnostics()
+            logger.info("Starting Twitter bot...")
+            ContinuousTwitterBot().run()  # This will run until interrupted
     except Exception as e:
         logger.error(f"Error running bot: {str(e)}", exc_info=True)
         sys.exit(1)
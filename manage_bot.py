@@ -1,30 +1,67 @@
 #!/usr/bin/env python3
 import os
-import json
+import sys
 import argparse
-import subprocess
-import psutil
+import fcntl
 import time
 from datetime import datetime
 
-def get_bot_pid():
-    """Get the PID of the running bot process"""
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+from utils.json_utils import load_json
+
+PID_FILE = 'bot.pid'
+
+def is_process_alive(pid):
+    """Check whether a process with the given PID exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def read_pid_file():
+    """Read the bot's PID file.
+
+    Returns (locked, pid): locked is True while a bot holds the file's
+    exclusive lock, and pid is None until that bot has written its PID.
+    """
+    try:
+        fd = os.open(PID_FILE, os.O_RDONLY)
+    except FileNotFoundError:
+        return False, None
+
+    try:
+        # A running bot holds an exclusive lock; if we can lock it, the file is stale
         try:
-            if proc.info['cmdline'] and 'continuous_twitter_bot.py' in ' '.join(proc.info['cmdline']):
-                return proc.info['pid']
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            return False, None
+        except OSError:
             pass
-    return None
+        pid = int(os.read(fd, 32).decode().strip() or 0)
+    except ValueError:
+        pid = 0
+    finally:
+        os.close(fd)
+
+    return True, pid or None
+
+def get_bot_pid():
+    """Get the PID of the running bot process from its PID file"""
+    locked, pid = read_pid_file()
+    return pid if locked and pid and is_process_alive(pid) else None
+
+def is_bot_starting():
+    """Whether a bot has locked the PID file but not yet written its PID"""
+    locked, pid = read_pid_file()
+    return locked and pid is None
 
 def get_bot_status():
     """Get current bot status"""
     status_file = 'bot_status.json'
     if os.path.exists(status_file):
         try:
-            with open(status_file, 'r') as f:
-                status = json.load(f)
-            return status
+            return load_json(status_file)
         except:
             return None
     return None
@@ -34,9 +71,7 @@ def get_config():
     config_file = 'config.json'
     if os.path.exists(config_file):
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-            return config['platforms']['twitter']
+            return load_json(config_file)['platforms']['twitter']
         except:
             return None
     return None
@@ -47,16 +82,24 @@ def start_bot():
     if pid:
         print("Bot is already running!")
         return
+    if is_bot_starting():
+        print("Bot is already starting!")
+        return
 
     try:
-        # Start the bot in the background
-        subprocess.Popen(
-            ['python', 'continuous_twitter_bot.py'],
-            stdout=open('bot_output.log', 'a'),
-            stderr=subprocess.STDOUT,
-            start_new_session=True
+        # Start the bot in the background in its own session; it writes its own
+        # rotating twitter_bot.log, so stdout/stderr are discarded
+        os.posix_spawn(
+            sys.executable,
+            [sys.executable, 'continuous_twitter_bot.py'],
+            os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_DUP2, 1, 2)
+            ],
+            setsid=True
         )
-        print("Bot started successfully! Monitor bot_output.log for details.")
+        print("Bot started successfully! Monitor twitter_bot.log for details.")
     except Exception as e:
         print(f"Failed to start bot: {str(e)}")
 
@@ -64,13 +107,16 @@ def stop_bot():
     """Stop the Twitter bot"""
     pid = get_bot_pid()
     if not pid:
-        print("Bot is not running!")
+        if is_bot_starting():
+            print("Bot is still starting, try again in a moment")
+        else:
+            print("Bot is not running!")
         return
 
     try:
         os.kill(pid, 15)  # Send SIGTERM
         time.sleep(2)
-        if psutil.pid_exists(pid):
+        if is_process_alive(pid):
             os.kill(pid, 9)  # Send SIGKILL if still running
         print("Bot stopped successfully!")
     except Exception as e:
@@ -83,7 +129,7 @@ def show_status():
     config = get_config()
     
     print("\n=== Twitter Bot Status ===")
-    print(f"Running: {'Yes' if pid else 'No'}")
+    print(f"Running: {'Yes' if pid else 'Starting' if is_bot_starting() else 'No'}")
     if pid:
         print(f"Process ID: {pid}")
     
@@ -106,7 +152,7 @@ def show_status():
             print(f"Total Tweets: {status['total_tweets']}")
             print(f"Total Replies: {status.get('total_replies', 0)}")
     
-    print("\nLog file: bot_output.log")
+    print("\nLog file: twitter_bot.log")
 
 def main():
     parser = argparse.ArgumentParser(description='Manage the Twitter Bot')
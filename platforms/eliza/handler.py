@@ -1,58 +1,129 @@
-import json
 import os
 import uuid
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, List
 
-from utils.db_utils import init_db_connection
+from utils.db_utils import init_db_connection, begin_immediate, optimize_db
+from utils.json_utils import load_json
+
+def _timestamp(when: Optional[datetime] = None) -> str:
+    """A time (default now) in the ISO format the datetime adapter would store.
+
+    Binding the pre-formatted string skips the adapter call for every
+    parameter that shares one transaction's timestamp.
+    """
+    return (when or datetime.now()).isoformat()
 
 class ElizaHandler:
+    # SQL is kept as constants so every call binds the same statement text,
+    # which sqlite3 serves from its per-connection statement cache
+    _SQL_INSERT_SESSION = '''INSERT INTO eliza_sessions
+                            (session_id, user_id, personality_type, start_time, last_activity)
+                            VALUES (?, ?, ?, ?, ?)'''
+    _SQL_INSERT_MESSAGE = '''INSERT INTO eliza_messages
+                            (session_id, message_type, content, timestamp)
+                            VALUES (?, ?, ?, ?)'''
+    _SQL_SELECT_SESSION = 'SELECT personality_type, is_active FROM eliza_sessions WHERE session_id = ?'
+    _SQL_TOUCH_SESSION = '''UPDATE eliza_sessions
+                           SET last_activity = ?
+                           WHERE session_id = ?'''
+    _SQL_BUMP_STATS = '''UPDATE platform_stats
+                        SET total_interactions = total_interactions + 1,
+                            last_activity = ?
+                        WHERE platform = 'eliza' '''
+    _SQL_SELECT_HISTORY = '''SELECT message_type, content, timestamp
+                            FROM eliza_messages
+                            WHERE session_id = ?
+                            ORDER BY timestamp ASC'''
+    _SQL_END_SESSION = '''UPDATE eliza_sessions
+                         SET is_active = 0,
+                             last_activity = ?
+                         WHERE session_id = ?'''
+    _SQL_SELECT_STATS = '''SELECT total_interactions, last_activity
+                          FROM platform_stats
+                          WHERE platform = 'eliza' '''
+    _SQL_DEACTIVATE_IDLE = '''UPDATE eliza_sessions
+                             SET is_active = 0
+                             WHERE rowid IN (SELECT rowid FROM eliza_sessions
+                                             WHERE is_active = 1
+                                             AND last_activity <= ?
+                                             LIMIT ?)'''
+    # Sessions deactivated per transaction by cleanup_inactive_sessions
+    CLEANUP_BATCH_SIZE = 1000
+
     def __init__(self, config_path: str = "config.json"):
         self.config = self._load_config(config_path)['platforms']['eliza']
         self.active_sessions = {}
         self.db_path = os.getenv("DB_PATH", "reddit_bot.db")
+        # One connection shared by all methods, opened on first use
+        self._conn = None
+        self._conn_path = None
+        self._lock = threading.Lock()
 
     def _load_config(self, config_path: str) -> Dict:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return load_json(config_path)
+
+    @contextmanager
+    def get_db_connection(self):
+        """Yield the shared connection and a cursor, holding the handler lock.
+
+        The connection is (re)opened if db_path changed since it was created.
+        Uncommitted work is rolled back if the block raises.
+        """
+        with self._lock:
+            if self._conn is None or self._conn_path != self.db_path:
+                if self._conn is not None:
+                    self._conn.close()
+                # Methods run on worker threads; the lock serializes access
+                self._conn = init_db_connection(self.db_path, check_same_thread=False)
+                self._conn_path = self.db_path
+                # Serves the session_id lookup and timestamp ordering in get_session_history
+                self._conn.execute('''CREATE INDEX IF NOT EXISTS idx_eliza_messages_session_ts
+                                    ON eliza_messages(session_id, timestamp)''')
+            c = self._conn.cursor()
+            try:
+                yield self._conn, c
+            except Exception:
+                self._conn.rollback()
+                raise
+            finally:
+                c.close()
+
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._conn_path = None
 
     def create_session(self, user_id: str, personality_type: Optional[str] = None) -> str:
         """Create a new chat session"""
         session_id = str(uuid.uuid4())
         personality = personality_type or self.config['personality_mapping']['default']
         
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            now = datetime.now()
-            c.execute('''INSERT INTO eliza_sessions 
-                        (session_id, user_id, personality_type, start_time, last_activity)
-                        VALUES (?, ?, ?, ?, ?)''',
+        with self.get_db_connection() as (conn, c):
+            now = _timestamp()
+            begin_immediate(conn)
+            c.execute(self._SQL_INSERT_SESSION,
                      (session_id, user_id, personality, now, now))
             
             # Get initial message based on personality
             initial_msg = self.config['personality_mapping'][personality]['initial_message']
             
-            c.execute('''INSERT INTO eliza_messages
-                        (session_id, message_type, content, timestamp)
-                        VALUES (?, ?, ?, ?)''',
+            c.execute(self._SQL_INSERT_MESSAGE,
                      (session_id, 'bot', initial_msg, now))
             
             conn.commit()
             return session_id
-        finally:
-            conn.close()
 
     def process_message(self, session_id: str, message: str) -> Tuple[bool, Optional[str]]:
         """Process a user message and generate a response"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
+        with self.get_db_connection() as (conn, c):
             # Check if session exists and is active
-            c.execute('SELECT personality_type, is_active FROM eliza_sessions WHERE session_id = ?',
-                     (session_id,))
+            c.execute(self._SQL_SELECT_SESSION, (session_id,))
             result = c.fetchone()
             
             if not result or not result[1]:
@@ -60,39 +131,25 @@ class ElizaHandler:
             
             personality_type = result[0]
             
-            # Store user message
-            now = datetime.now()
-            c.execute('''INSERT INTO eliza_messages
-                        (session_id, message_type, content, timestamp)
-                        VALUES (?, ?, ?, ?)''',
-                     (session_id, 'user', message, now))
-            
-            # Generate response based on personality
+            # Generate response based on personality before opening the write
+            # transaction, so the write lock is not held while it runs
             response = self._generate_response(message, personality_type)
             
-            # Store bot response
-            c.execute('''INSERT INTO eliza_messages
-                        (session_id, message_type, content, timestamp)
-                        VALUES (?, ?, ?, ?)''',
-                     (session_id, 'bot', response, now))
+            # Store user message and bot response
+            now = _timestamp()
+            begin_immediate(conn)
+            c.executemany(self._SQL_INSERT_MESSAGE,
+                         [(session_id, 'user', message, now),
+                          (session_id, 'bot', response, now)])
             
             # Update session activity
-            c.execute('''UPDATE eliza_sessions 
-                        SET last_activity = ?
-                        WHERE session_id = ?''',
-                     (now, session_id))
+            c.execute(self._SQL_TOUCH_SESSION, (now, session_id))
             
             # Update platform stats
-            c.execute('''UPDATE platform_stats 
-                        SET total_interactions = total_interactions + 1,
-                            last_activity = ?
-                        WHERE platform = 'eliza' ''',
-                     (now,))
+            c.execute(self._SQL_BUMP_STATS, (now,))
             
             conn.commit()
             return True, response
-        finally:
-            conn.close()
 
     def _generate_response(self, message: str, personality_type: str) -> str:
         """Generate a response based on the message and personality type"""
@@ -102,15 +159,8 @@ class ElizaHandler:
 
     def get_session_history(self, session_id: str) -> List[Dict]:
         """Get message history for a session"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            c.execute('''SELECT message_type, content, timestamp
-                        FROM eliza_messages
-                        WHERE session_id = ?
-                        ORDER BY timestamp ASC''',
-                     (session_id,))
+        with self.get_db_connection() as (conn, c):
+            c.execute(self._SQL_SELECT_HISTORY, (session_id,))
             
             history = []
             for row in c.fetchall():
@@ -120,35 +170,21 @@ class ElizaHandler:
                     'timestamp': row[2]
                 })
             return history
-        finally:
-            conn.close()
 
     def end_session(self, session_id: str) -> bool:
         """End a chat session"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            c.execute('''UPDATE eliza_sessions 
-                        SET is_active = 0,
-                            last_activity = ?
-                        WHERE session_id = ?''',
-                     (datetime.now(), session_id))
+        with self.get_db_connection() as (conn, c):
+            begin_immediate(conn)
+            c.execute(self._SQL_END_SESSION, (_timestamp(), session_id))
             
             conn.commit()
+            optimize_db(conn)
             return True
-        finally:
-            conn.close()
 
     def get_platform_stats(self) -> Dict:
         """Get platform statistics"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            c.execute('''SELECT total_interactions, last_activity 
-                        FROM platform_stats 
-                        WHERE platform = 'eliza' ''')
+        with self.get_db_connection() as (conn, c):
+            c.execute(self._SQL_SELECT_STATS)
             result = c.fetchone()
             
             if result:
@@ -157,26 +193,25 @@ class ElizaHandler:
                     'last_activity': result[1]
                 }
             return {'total_interactions': 0, 'last_activity': None}
-        finally:
-            conn.close()
 
     def cleanup_inactive_sessions(self, timeout_seconds: int = None) -> int:
-        """Clean up inactive sessions"""
+        """Deactivate sessions idle for longer than timeout_seconds"""
         if timeout_seconds is None:
             timeout_seconds = self.config['session_timeout']
             
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            now = datetime.now()
-            c.execute('''UPDATE eliza_sessions 
-                        SET is_active = 0
-                        WHERE is_active = 1 
-                        AND datetime(last_activity) <= datetime(?)''',
-                     (now,))
-            count = c.rowcount
-            conn.commit()
-            return count
-        finally:
-            conn.close() 
\ No newline at end of file
+        with self.get_db_connection() as (conn, c):
+            # ISO timestamps compare correctly as strings, so the stored column
+            # is compared directly instead of through datetime() per row
+            cutoff = _timestamp(datetime.now() - timedelta(seconds=timeout_seconds))
+            # Commit in batches so a large backlog doesn't hold the write lock
+            # against create_session/process_message for the whole sweep
+            count = 0
+            while True:
+                begin_immediate(conn)
+                c.execute(self._SQL_DEACTIVATE_IDLE, (cutoff, self.CLEANUP_BATCH_SIZE))
+                count += c.rowcount
+                conn.commit()
+                if c.rowcount < self.CLEANUP_BATCH_SIZE:
+                    break
+            optimize_db(conn)
+            return count 
\ No newline at end of file
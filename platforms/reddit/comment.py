@@ -1,7 +1,10 @@
 import os
+import time
 import random
 import logging
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import praw
 from dotenv import load_dotenv
 from utils.helper import get_reddit_instance, get_openai_response, is_valid_subreddit, handle_rate_limit
@@ -16,31 +19,27 @@ logger = logging.getLogger(__name__)
 
 personality_manager = PersonalityManager()
 
-def get_random_post(reddit: praw.Reddit, subreddit_name: str):
-    """Get a random post from the subreddit"""
-    try:
-        subreddit = reddit.subreddit(subreddit_name)
-        posts = list(subreddit.hot(limit=20))  # Get hot posts
-        if not posts:
-            logger.error(f"No posts found in subreddit {subreddit_name}")
-            return None
-        return random.choice(posts)
-    except praw.exceptions.RedditAPIException as e:
-        logger.error(f"Reddit API Error getting posts: {str(e)}", exc_info=True)
-        return None
-    except Exception as e:
-        logger.error(f"Error getting random post: {str(e)}", exc_info=True)
-        return None
+# Generates contrasting replies concurrently with comment submission
+_reply_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='comment-reply')
 
-def generate_comment_content(personality, post_content):
-    """Generate comment content based on personality and post"""
-    try:
-        base_prompt = personality_manager.get_personality_prompt(personality, is_reply=True)
-        enhanced_prompt = f"""
+# Hot listings per subreddit: name -> (fetched_at monotonic, posts)
+_HOT_CACHE = {}
+DEFAULT_HOT_CACHE_TTL = 90
+
+_local = threading.local()
+
+def _rng() -> random.Random:
+    """Per-thread generator, so bot threads don't share the global random lock"""
+    rng = getattr(_local, 'rng', None)
+    if rng is None:
+        rng = _local.rng = random.Random()
+    return rng
+
+_COMMENT_PROMPT_TEMPLATE = """
 {base_prompt}
 
-As {personality['name']}, engage thoughtfully with this post from your unique perspective.
-You are {personality['bio'][0]} participating in an intellectual discussion with peers.
+As {name}, engage thoughtfully with this post from your unique perspective.
+You are {bio} participating in an intellectual discussion with peers.
 Respond naturally and conversationally, while drawing from your expertise to add value to the discussion.
 
 The post you're responding to:
@@ -50,16 +49,63 @@ Remember to:
 - Engage directly with the key points
 - Share your unique insights based on your experience
 - Maintain a natural, flowing conversation
-- Draw from your specific expertise in {', '.join(personality['knowledge'][:3])}
-- Keep your characteristic style: {', '.join(personality['style']['chat'])}
+- Draw from your specific expertise in {knowledge_head}
+- Keep your characteristic style: {style_chat}
 """
+
+_REPLY_PROMPT_TEMPLATE = """As {name}, you're continuing this intellectual discussion.
+You are {bio} engaging with a thought-provoking comment.
+Respond naturally and thoughtfully, building on the conversation while offering your unique perspective.
+
+The comment you're responding to:
+{comment_content}
+
+Remember to:
+- Build on the discussion naturally
+- Share your contrasting viewpoint respectfully
+- Maintain the flow of conversation
+- Draw from your expertise in {knowledge_head}
+- Keep your characteristic style: {style_chat}"""
+
+def get_random_post(reddit: praw.Reddit, subreddit_name: str):
+    """Get a random post from the subreddit's hot listing, cached for hot_cache_ttl seconds"""
+    try:
+        ttl = personality_manager.get_platform_settings('reddit').get('hot_cache_ttl', DEFAULT_HOT_CACHE_TTL)
+        fetched_at, posts = _HOT_CACHE.get(subreddit_name, (0.0, None))
+        if not posts or time.monotonic() - fetched_at >= ttl:
+            subreddit = reddit.subreddit(subreddit_name)
+            posts = list(subreddit.hot(limit=20))  # Get hot posts
+            _HOT_CACHE[subreddit_name] = (time.monotonic(), posts)
+        if not posts:
+            logger.error("No posts found in subreddit %s", subreddit_name)
+            return None
+        return _rng().choice(posts)
+    except praw.exceptions.RedditAPIException as e:
+        logger.error("Reddit API Error getting posts: %s", e, exc_info=True)
+        return None
+    except Exception as e:
+        logger.error("Error getting random post: %s", e, exc_info=True)
+        return None
+
+def generate_comment_content(personality, post_content):
+    """Generate comment content based on personality and post"""
+    try:
+        base_prompt = personality_manager.get_personality_prompt(personality, 'reddit', is_reply=True)
+        enhanced_prompt = _COMMENT_PROMPT_TEMPLATE.format_map({
+            'base_prompt': base_prompt,
+            'name': personality['name'],
+            'bio': personality['bio'][0],
+            'knowledge_head': personality['_knowledge_head'],
+            'style_chat': personality['_style_chat'],
+            'post_content': post_content
+        })
         content = get_openai_response(enhanced_prompt)
         
         # Add personality signature at the top
         signature = f"*Perspective from **{personality['name']}** - {personality['bio'][0]}*\n\n"
         return signature + content
     except Exception as e:
-        logger.error(f"Error generating comment content: {str(e)}", exc_info=True)
+        logger.error("Error generating comment content: %s", e, exc_info=True)
         return None
 
 @handle_rate_limit
@@ -76,13 +122,13 @@ def generate_comments():
             return False
             
         personality = personality_manager.get_random_personality()
-        logger.info(f"Selected Personality for Comment: {personality['name']}")
+        logger.info("Selected Personality for Comment: %s", personality['name'])
         
         # Randomly select a subreddit from the personality's list
-        subreddit_name = random.choice(personality['settings']['subreddits'])
+        subreddit_name = _rng().choice(personality['settings']['subreddits'])
         
         if not is_valid_subreddit(reddit, subreddit_name):
-            logger.error(f"Subreddit {subreddit_name} is not accessible")
+            logger.error("Subreddit %s is not accessible", subreddit_name)
             return False
             
         # Get a random post to comment on
@@ -97,50 +143,59 @@ def generate_comments():
                 logger.error("Failed to generate comment content")
                 return False
 
-            comment = submit_comment(post, comment_content)
+            # Chance for another personality to reply to this comment. The reply
+            # only depends on the comment text, so it is generated while the
+            # comment itself is being submitted; the one draft is kept across
+            # submit_comment's rate limit retries
+            reply_future = None
+            if personality_manager.should_interact(personality['name']):
+                try:
+                    contrasting_personality = personality_manager.get_contrasting_personality(personality['name'])
+                    reply_prompt = _REPLY_PROMPT_TEMPLATE.format_map({
+                        'name': contrasting_personality['name'],
+                        'bio': contrasting_personality['bio'][0],
+                        'comment_content': comment_content,
+                        'knowledge_head': contrasting_personality['_knowledge_head'],
+                        'style_chat': contrasting_personality['_style_chat']
+                    })
+                    reply_future = _reply_executor.submit(get_openai_response, reply_prompt)
+                except Exception as e:
+                    logger.error("Error creating contrasting reply: %s", e, exc_info=True)
+
+            comment = None
+            try:
+                comment = submit_comment(post, comment_content)
+            finally:
+                if not comment and reply_future:
+                    # No comment to reply to; drop the draft if it has not started
+                    reply_future.cancel()
             if not comment:
                 logger.error("Failed to submit comment (rate limited)")
                 return False
                 
-            logger.info(f"Comment created by {personality['name']} on post {post.id}")
+            logger.info("Comment created by %s on post %s", personality['name'], post.id)
             
-            # Chance for another personality to reply to this comment
-            if personality_manager.should_interact(personality['name']):
+            if reply_future:
                 try:
-                    contrasting_personality = personality_manager.get_contrasting_personality(personality['name'])
-                    reply_prompt = f"""As {contrasting_personality['name']}, you're continuing this intellectual discussion.
-You are {contrasting_personality['bio'][0]} engaging with a thought-provoking comment.
-Respond naturally and thoughtfully, building on the conversation while offering your unique perspective.
-
-The comment you're responding to:
-{comment_content}
-
-Remember to:
-- Build on the discussion naturally
-- Share your contrasting viewpoint respectfully
-- Maintain the flow of conversation
-- Draw from your expertise in {', '.join(contrasting_personality['knowledge'][:3])}
-- Keep your characteristic style: {', '.join(contrasting_personality['style']['chat'])}"""
-
-                    reply_content = get_openai_response(reply_prompt)
+                    reply_content = reply_future.result()
                     if reply_content:
                         # Add personality signature at the top
                         reply_content = f"*Insights from **{contrasting_personality['name']}** - {contrasting_personality['bio'][0]}*\n\n{reply_content}"
                         reply = submit_comment(comment, reply_content)
                         if reply:
-                            logger.info(f"Added reply from {contrasting_personality['name']}")
+                            logger.info("Added reply from %s", contrasting_personality['name'])
                 except Exception as e:
-                    logger.error(f"Error creating contrasting reply: {str(e)}", exc_info=True)
+                    logger.error("Error creating contrasting reply: %s", e, exc_info=True)
             
             return True
             
         except praw.exceptions.RedditAPIException as e:
-            logger.error(f"Reddit API Error posting comment: {str(e)}", exc_info=True)
+            logger.error("Reddit API Error posting comment: %s", e, exc_info=True)
             return False
         except Exception as e:
-            logger.error(f"Error posting comment: {str(e)}", exc_info=True)
+            logger.error("Error posting comment: %s", e, exc_info=True)
             return False
             
     except Exception as e:
-        logger.error(f"Error in generate_comments: {str(e)}", exc_info=True)
+        logger.error("Error in generate_comments: %s", e, exc_info=True)
         return False
\ No newline at end of file
@@ -1,32 +1,121 @@
 """Reddit Platform Handler"""
 
 import praw
-import json
+import requests
+from requests.adapters import HTTPAdapter
 import os
+import time
+import random
 import logging
 import sqlite3
-from datetime import datetime
-from typing import Dict, Optional, List
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Tuple, Iterator
 import threading
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 
-from utils.db_utils import init_db_connection
+from utils.db_utils import init_db_connection, begin_immediate
+from utils.json_utils import load_json, dumps, loads
 from utils.personality_manager import PersonalityManager
 from utils.openai_utils import get_openai_response
 from utils.post import generate_post_content, generate_title, get_appropriate_flair
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
+def _rng() -> random.Random:
+    """Per-thread generator, so bot threads don't share the global random lock"""
+    rng = getattr(_local, 'rng', None)
+    if rng is None:
+        rng = _local.rng = random.Random()
+    return rng
+
+# Upper bound on concurrent network calls (listing fetches, comment generation)
+MAX_NETWORK_WORKERS = 8
+# Upper bound on subreddits processed at the same time
+MAX_SUBREDDIT_WORKERS = 8
+
+# HTTP connection pool shared by every thread using the Reddit client
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+
+# Longest rate-limit wait PRAW sleeps through before raising
+RATELIMIT_SECONDS = 600
+
+# Seconds a subreddit's chosen flair is reused before asking Reddit again
+FLAIR_CACHE_TTL = 3600
+
+# Minimum time between two new posts by the bot in the same subreddit
+POST_INTERVAL = timedelta(days=1)
+
+_COMMENT_PROMPT_TEMPLATE = """
+{base_prompt}
+
+As {name}, engage thoughtfully with this Reddit post from your unique perspective.
+Write a natural, engaging response that adds value to the discussion.
+
+The post title: {title}
+The post content: {content}
+
+Remember:
+- You are {name}, {bio}
+- Draw from your specific knowledge in: {knowledge_head}
+- Maintain your characteristic style: {style_chat}
+- Keep the response concise but informative
+"""
+
+@dataclass(slots=True)
+class _ConnState:
+    """Database connection and transaction bookkeeping for one thread"""
+    owner: threading.Thread
+    conn: Optional[sqlite3.Connection] = None
+    cursor: Optional[sqlite3.Cursor] = None
+    active: bool = False
+    tx_count: int = 0
+    last_tx_id: int = 0
+
 class RedditHandler:
+    # Write SQL is kept as constants so every call binds the same statement
+    # text, which sqlite3 serves from its per-connection statement cache
+    _SQL_INSERT_POST = '''INSERT INTO posts 
+                         (platform, post_id, username, subreddit, post_title, post_content, 
+                          personality_id, personality_context, timestamp)
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+    _SQL_INSERT_LISTED_POST = '''INSERT OR IGNORE INTO posts 
+                                (platform, post_id, username, subreddit, post_title, post_content, timestamp)
+                                VALUES (?, ?, ?, ?, ?, ?, ?)'''
+    _SQL_INSERT_COMMENT = '''INSERT INTO comments 
+                            (platform, username, comment_id, post_id, comment_content, timestamp,
+                             personality_id, personality_fk)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+    _SQL_BUMP_STATS = '''UPDATE platform_stats 
+                        SET total_interactions = total_interactions + ?,
+                            last_activity = ?
+                        WHERE platform = 'reddit' '''
+    # Only posts the bot created carry a personality_id
+    _SQL_SELECT_RECENT_OWN_POST = '''SELECT 1 FROM posts
+                                    WHERE platform = 'reddit' AND subreddit = ?
+                                    AND personality_id IS NOT NULL AND timestamp > ?
+                                    LIMIT 1'''
+    _SQL_INSERT_PERSONALITY = 'INSERT OR IGNORE INTO personalities (name, style_json) VALUES (?, ?)'
+    _SQL_SELECT_PERSONALITY_ID = 'SELECT id FROM personalities WHERE name = ?'
+
+    # Set once get_recent_activity has logged the posts/comments schemas
+    _schema_logged = False
+
     def __init__(self, personality_manager: PersonalityManager, config_path: str = "config.json"):
-        self._thread_local = threading.local()
-        self._init_thread_state()
+        # Per-thread connection state keyed by thread ident; the lock only
+        # guards inserts and removals, lookups are plain dict reads
+        self._states: Dict[int, _ConnState] = {}
+        self._states_lock = threading.Lock()
         thread_id = threading.get_ident()
-        logging.info(f"[Thread Lifecycle] Handler initialized in thread {thread_id}")
+        logger.info("[Thread Lifecycle] Handler initialized in thread %s", thread_id)
         
         try:
-            logger.info(f"Current working directory: {os.getcwd()}")
-            logger.info(f"Using config path: {os.path.abspath(config_path)}")
+            logger.info("Current working directory: %s", os.getcwd())
+            logger.info("Using config path: %s", os.path.abspath(config_path))
             
             self.config = self._load_config(config_path)['platforms']['reddit']
             if not self.config['enabled']:
@@ -34,14 +123,16 @@ class RedditHandler:
             logger.info("Config loaded successfully")
             
         except Exception as e:
-            logger.error(f"Failed to load config: {str(e)}", exc_info=True)
+            logger.error("Failed to load config: %s", e, exc_info=True)
             raise
 
         self.personality_manager = personality_manager
         self.db_path = os.getenv("DB_PATH", "bot.db")
-        logger.info(f"Using database path in handler: {self.db_path}")
+        logger.info("Using database path in handler: %s", self.db_path)
         
         self.active_personality = None
+        self._personality_ids: Dict[str, int] = {}  # name -> personalities.id
+        self._flair_cache: Dict[str, Tuple[float, str]] = {}  # subreddit -> (fetched_at, flair_id)
         self._load_active_personality()
         
         try:
@@ -53,129 +144,128 @@ class RedditHandler:
                 'REDDIT_USERNAME': bool(os.getenv('REDDIT_USERNAME')),
                 'REDDIT_PASSWORD': bool(os.getenv('REDDIT_PASSWORD'))
             }
-            logger.info(f"Environment variables present: {env_vars}")
+            logger.info("Environment variables present: %s", env_vars)
             
             self.reddit = self._init_reddit()
             logger.info("Reddit API client initialized successfully")
             
             # Test Reddit connection
-            username = self.reddit.user.me().name
-            logger.info(f"Successfully authenticated as: {username}")
+            self.username = self.reddit.user.me().name
+            logger.info("Successfully authenticated as: %s", self.username)
             
         except Exception as e:
-            logger.error(f"Failed to initialize Reddit API client: {str(e)}", exc_info=True)
+            logger.error("Failed to initialize Reddit API client: %s", e, exc_info=True)
             raise
 
-    def _init_thread_state(self):
-        """Initialize thread-local state"""
-        self._thread_local.connection_thread_id = None
-        self._thread_local.connection_active = False
-        self._thread_local.transaction_count = 0
-        self._thread_local.last_transaction_id = 0
+    def _state(self) -> _ConnState:
+        """Get the calling thread's connection state, creating it on first use"""
+        thread = threading.current_thread()
+        state = self._states.get(thread.ident)
+        if state is None or state.owner is not thread:
+            with self._states_lock:
+                if state is not None:
+                    # The ident was reused by a new thread
+                    logger.info("[Thread Transition] Dropping state of finished thread %s (Active=%s, Transactions=%s)",
+                                thread.ident, state.active, state.tx_count)
+                # Forget threads that exited without cleaning up; their
+                # connections can't be closed from here and are left to GC
+                for ident in [i for i, st in self._states.items() if not st.owner.is_alive()]:
+                    del self._states[ident]
+                state = self._states[thread.ident] = _ConnState(owner=thread)
+        return state
 
     @property
     def next_transaction_id(self):
         """Get next transaction ID for this thread"""
-        if not hasattr(self._thread_local, 'last_transaction_id'):
-            self._thread_local.last_transaction_id = 0
-        self._thread_local.last_transaction_id += 1
-        return self._thread_local.last_transaction_id
+        state = self._state()
+        state.last_tx_id += 1
+        return state.last_tx_id
 
     @property
     def db_conn(self):
-        """Get thread-local database connection"""
-        thread_id = threading.get_ident()
-        if not hasattr(self._thread_local, 'db_conn'):
-            logging.info(f"[Thread State] Creating new connection in thread {thread_id} (No previous connection)")
-            self._init_thread_state()
-            self._thread_local.db_conn = init_db_connection(self.db_path)
-            self._thread_local.connection_thread_id = thread_id
-            self._thread_local.connection_active = True
-            logging.info(f"[Thread State] Connection established in thread {thread_id} (State: Active=True, Transactions=0)")
-        elif self._thread_local.connection_thread_id != thread_id:
-            old_thread = self._thread_local.connection_thread_id
-            logging.info(f"[Thread Transition] Moving connection from thread {old_thread} to {thread_id}")
-            logging.info(f"[Thread State] Old connection state - Active={self._thread_local.connection_active}, Transactions={self._thread_local.transaction_count}")
-            self._cleanup_thread()
-            self._init_thread_state()
-            self._thread_local.db_conn = init_db_connection(self.db_path)
-            self._thread_local.connection_thread_id = thread_id
-            self._thread_local.connection_active = True
-            logging.info(f"[Thread State] New connection established in thread {thread_id}")
-        return self._thread_local.db_conn
+        """Get this thread's database connection"""
+        state = self._state()
+        if state.conn is None:
+            thread_id = threading.get_ident()
+            logger.info("[Thread State] Creating new connection in thread %s (No previous connection)", thread_id)
+            state.conn = init_db_connection(self.db_path)
+            state.active = True
+            logger.info("[Thread State] Connection established in thread %s (State: Active=True, Transactions=0)", thread_id)
+        return state.conn
 
     @property
     def db_cursor(self):
-        """Get thread-local database cursor"""
-        if not hasattr(self._thread_local, 'db_cursor'):
-            self._thread_local.db_cursor = self.db_conn.cursor()
-        return self._thread_local.db_cursor
+        """Get this thread's database cursor"""
+        state = self._state()
+        if state.cursor is None:
+            state.cursor = self.db_conn.cursor()
+        return state.cursor
 
     @contextmanager
     def get_db_connection(self):
         """Context manager for database operations"""
         thread_id = threading.get_ident()
+        state = self._state()
         transaction_id = self.next_transaction_id
         
-        # Ensure thread state is initialized
-        if not hasattr(self._thread_local, 'transaction_count'):
-            self._init_thread_state()
-        
-        self._thread_local.transaction_count += 1
-        logging.info(f"[Transaction] Starting transaction {transaction_id} in thread {thread_id} (Total active: {self._thread_local.transaction_count})")
+        state.tx_count += 1
+        logger.debug("[Transaction] Starting transaction %s in thread %s (Total active: %s)", transaction_id, thread_id, state.tx_count)
         
         try:
             conn = self.db_conn
             cursor = self.db_cursor
-            logging.info(f"[Connection State] Using connection in thread {thread_id} (Active={self._thread_local.connection_active}, Transactions={self._thread_local.transaction_count})")
+            state.active = True
+            logger.debug("[Connection State] Using connection in thread %s (Active=%s, Transactions=%s)", thread_id, state.active, state.tx_count)
             yield conn, cursor
         except Exception as e:
-            logging.error(f"[Transaction Error] Error in transaction {transaction_id} in thread {thread_id}: {str(e)}")
-            if hasattr(self._thread_local, 'db_conn'):
-                self._thread_local.db_conn.rollback()
-                logging.info(f"[Transaction] Rolled back transaction {transaction_id} in thread {thread_id}")
+            logger.error("[Transaction Error] Error in transaction %s in thread %s: %s", transaction_id, thread_id, e)
+            if state.conn is not None:
+                state.conn.rollback()
+                logger.info("[Transaction] Rolled back transaction %s in thread %s", transaction_id, thread_id)
             raise
         else:
-            if hasattr(self._thread_local, 'db_conn'):
-                self._thread_local.db_conn.commit()
-                logging.info(f"[Transaction] Committed transaction {transaction_id} in thread {thread_id}")
+            if state.conn is not None:
+                state.conn.commit()
+                logger.debug("[Transaction] Committed transaction %s in thread %s", transaction_id, thread_id)
         finally:
-            self._thread_local.transaction_count = max(0, self._thread_local.transaction_count - 1)
-            logging.info(f"[Transaction] Completed transaction {transaction_id} in thread {thread_id} (Remaining active: {self._thread_local.transaction_count})")
+            state.tx_count = max(0, state.tx_count - 1)
+            logger.debug("[Transaction] Completed transaction %s in thread %s (Remaining active: %s)", transaction_id, thread_id, state.tx_count)
             
             # Consider cleanup if no active transactions
-            if self._thread_local.transaction_count == 0:
-                logging.info(f"[Connection State] No active transactions in thread {thread_id}, marking for cleanup")
-                self._thread_local.connection_active = False
+            if state.tx_count == 0:
+                logger.debug("[Connection State] No active transactions in thread %s, marking for cleanup", thread_id)
+                state.active = False
 
     def _cleanup_thread(self):
-        """Clean up thread-local resources"""
+        """Close the calling thread's cursor and connection"""
         thread_id = threading.get_ident()
-        transaction_count = getattr(self._thread_local, 'transaction_count', 0)
-        connection_active = getattr(self._thread_local, 'connection_active', False)
+        state = self._states.get(thread_id)
+        if state is None or state.owner is not threading.current_thread():
+            return
         
-        logging.info(f"[Cleanup] Starting cleanup for thread {thread_id} (Active={connection_active}, Transactions={transaction_count})")
+        logger.debug("[Cleanup] Starting cleanup for thread %s (Active=%s, Transactions=%s)", thread_id, state.active, state.tx_count)
         
-        if hasattr(self._thread_local, 'db_cursor'):
-            logging.info(f"[Cleanup] Closing cursor in thread {thread_id}")
-            self._thread_local.db_cursor.close()
-            delattr(self._thread_local, 'db_cursor')
+        if state.cursor is not None:
+            logger.debug("[Cleanup] Closing cursor in thread %s", thread_id)
+            state.cursor.close()
         
-        if hasattr(self._thread_local, 'db_conn'):
-            if transaction_count > 0:
-                logging.warning(f"[Cleanup] Cleaning up connection with {transaction_count} active transactions in thread {thread_id}")
-            logging.info(f"[Cleanup] Closing connection in thread {thread_id}")
-            self._thread_local.db_conn.close()
-            self._init_thread_state()
-            delattr(self._thread_local, 'db_conn')
+        if state.conn is not None:
+            if state.tx_count > 0:
+                logger.warning("[Cleanup] Cleaning up connection with %s active transactions in thread %s", state.tx_count, thread_id)
+            logger.debug("[Cleanup] Closing connection in thread %s", thread_id)
+            state.conn.close()
+        
+        with self._states_lock:
+            self._states.pop(thread_id, None)
 
     def __del__(self):
         """Destructor to ensure cleanup"""
-        if hasattr(self, '_thread_local'):
+        if hasattr(self, '_states'):
             self._cleanup_thread()
 
     def _load_active_personality(self):
-        """Load the active personality from config"""
+        """Load the active personality and its reply probability from config"""
+        self._reply_probability = self.config.get('personality', {}).get('settings', {}).get('reply_probability', 0.7)
         try:
             personality_name = self.config['personality']['active']
             if not personality_name:
@@ -184,16 +274,15 @@ class RedditHandler:
                 
             self.active_personality = self.personality_manager.get_personality(personality_name)
             if self.active_personality:
-                logger.info(f"Loaded active personality: {personality_name}")
+                logger.info("Loaded active personality: %s", personality_name)
             else:
-                logger.error(f"Failed to load configured personality: {personality_name}")
+                logger.error("Failed to load configured personality: %s", personality_name)
         except Exception as e:
-            logger.error(f"Error loading active personality: {str(e)}")
+            logger.error("Error loading active personality: %s", e)
 
     def _load_config(self, config_path: str) -> Dict:
-        logger.debug(f"Loading config from {config_path}")
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        logger.debug("Loading config from %s", config_path)
+        return load_json(config_path)
 
     def _init_reddit(self) -> praw.Reddit:
         """Initialize Reddit API client"""
@@ -206,179 +295,329 @@ class RedditHandler:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+        # A keep-alive pool large enough for every worker thread, so concurrent
+        # calls reuse open TLS connections instead of handshaking again
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                                              pool_maxsize=HTTP_POOL_MAXSIZE))
         return praw.Reddit(
             client_id=os.getenv('REDDIT_CLIENT_ID'),
             client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
             user_agent=os.getenv('REDDIT_USER_AGENT'),
             username=os.getenv('REDDIT_USERNAME'),
-            password=os.getenv('REDDIT_PASSWORD')
+            password=os.getenv('REDDIT_PASSWORD'),
+            ratelimit_seconds=RATELIMIT_SECONDS,
+            requestor_kwargs={'session': session}
         )
 
+    def _get_flair(self, subreddit_name: str) -> Optional[str]:
+        """Pick the flair for a new post, reusing the choice for FLAIR_CACHE_TTL seconds"""
+        now = time.monotonic()
+        hit = self._flair_cache.get(subreddit_name)
+        if hit and now - hit[0] < FLAIR_CACHE_TTL:
+            return hit[1]
+        flair_id = get_appropriate_flair(self.reddit, subreddit_name)
+        # None may come from a failed fetch, so only a real choice is reused
+        if flair_id is not None:
+            self._flair_cache[subreddit_name] = (now, flair_id)
+        return flair_id
+
+    def _posted_recently(self, cursor, subreddit_name: str) -> bool:
+        """Check whether the bot created a post in the subreddit within POST_INTERVAL"""
+        # Stored timestamps are local isoformat strings, so the cutoff is built
+        # the same way rather than with SQLite's UTC datetime('now')
+        cutoff = (datetime.now() - POST_INTERVAL).isoformat()
+        cursor.execute(self._SQL_SELECT_RECENT_OWN_POST, (subreddit_name, cutoff))
+        return cursor.fetchone() is not None
+
+    def _fetch_new_submissions(self, subreddit_name: str) -> List:
+        """Fetch the latest submissions of a subreddit.
+
+        raw_json=1 returns titles and bodies without HTML entity escaping. The
+        listing already carries each author's name, so reading it later
+        doesn't trigger a lazy fetch.
+        """
+        return list(self.reddit.subreddit(subreddit_name).new(limit=5, params={'raw_json': 1}))
+
     def process_subreddits(self, commenters_config: Dict = None):
-        """Process configured subreddits"""
+        """Process configured subreddits concurrently, one worker thread each"""
         thread_id = threading.get_ident()
-        logging.info(f"[Process] Starting subreddit processing in thread {thread_id}")
+        logger.info("[Process] Starting subreddit processing in thread %s", thread_id)
         
+        target_subreddits = self.config.get('target_subreddits', ['FlavumHiveAI'])
         try:
             with self.get_db_connection() as (conn, cursor):
                 # Test connection
                 cursor.execute("SELECT COUNT(*) FROM posts")
                 count = cursor.fetchone()[0]
-                logger.info(f"Current post count in thread {thread_id}: {count}")
+                logger.info("Current post count in thread %s: %s", thread_id, count)
 
-                for subreddit_name in self.config.get('target_subreddits', ['FlavumHiveAI']):
-                    logger.info(f"Processing subreddit: {subreddit_name}")
-                    
-                    try:
-                        subreddit = self.reddit.subreddit(subreddit_name)
-                        logger.info(f"Successfully accessed subreddit: {subreddit_name}")
-                        
-                        # Generate and submit a new post
-                        personality = self.active_personality or self.personality_manager.get_random_personality('reddit')
-                        if personality:
-                            logger.info(f"Generating post as personality: {personality['name']}")
-                            post_content = generate_post_content(personality)
-                            if post_content:
-                                title = generate_title(post_content, personality)
-                                flair_id = get_appropriate_flair(self.reddit, subreddit_name)
-                                
-                                submission = subreddit.submit(title=title, selftext=post_content, flair_id=flair_id)
-                                logger.info(f"Created new post: {submission.id}")
-                                
-                                # Store the post
-                                now = datetime.now()
-                                cursor.execute('''INSERT INTO posts 
-                                            (platform, post_id, username, subreddit, post_title, post_content, 
-                                             personality_id, personality_context, timestamp)
-                                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                                         ('reddit', submission.id, submission.author.name,
-                                          subreddit_name, title, post_content, personality['name'],
-                                          json.dumps({'name': personality['name'], 'style': personality['style']['post']}),
-                                          now))
-                                
-                                # Process comments for new post
-                                self._process_comments(submission, cursor)
-                        
-                        # Process existing posts
-                        for submission in subreddit.new(limit=5):
-                            logger.debug(f"Processing existing submission: {submission.id}")
-                            cursor.execute("SELECT id FROM posts WHERE post_id = ?", (submission.id,))
-                            if not cursor.fetchone():
-                                logger.info(f"Processing new post: {submission.id}")
-                                try:
-                                    now = datetime.now()
-                                    cursor.execute('''INSERT INTO posts 
-                                                (platform, post_id, username, subreddit, post_title, post_content, timestamp)
-                                                VALUES (?, ?, ?, ?, ?, ?, ?)''',
-                                             ('reddit', submission.id, submission.author.name,
-                                              subreddit_name, submission.title, submission.selftext, now))
-                                    
-                                    logger.info(f"Successfully stored post {submission.id}")
-                                    
-                                    # Process comments for existing post
-                                    self._process_comments(submission, cursor)
-                                        
-                                except Exception as e:
-                                    logger.error(f"Error processing post {submission.id}: {str(e)}", exc_info=True)
-                                    continue
-                            
-                            conn.commit()
-                            logger.debug(f"Committed changes for subreddit {subreddit_name}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing subreddit {subreddit_name}: {str(e)}", exc_info=True)
-                        continue
+            # Listing fetches and comment drafts share one pool; subreddits get their
+            # own so a subreddit waiting on its drafts can never starve them
+            subreddit_workers = max(1, min(MAX_SUBREDDIT_WORKERS, len(target_subreddits)))
+            with ThreadPoolExecutor(max_workers=MAX_NETWORK_WORKERS) as pool, \
+                    ThreadPoolExecutor(max_workers=subreddit_workers,
+                                       thread_name_prefix='subreddit') as subreddit_pool:
+                listings = {name: pool.submit(self._fetch_new_submissions, name)
+                            for name in target_subreddits}
+                for future in [subreddit_pool.submit(self._process_subreddit, name, listings[name], pool)
+                               for name in target_subreddits]:
+                    future.result()
                     
         except Exception as e:
-            logging.error(f"[Process Error] Failed in thread {thread_id}: {str(e)}")
+            logger.error("[Process Error] Failed in thread %s: %s", thread_id, e)
             raise
         finally:
-            if hasattr(self._thread_local, 'connection_active'):
-                logging.info(f"[Process] Ending subreddit processing in thread {thread_id} (Active={self._thread_local.connection_active}, Transactions={self._thread_local.transaction_count})")
-            if hasattr(self._thread_local, 'connection_active') and not self._thread_local.connection_active:
-                self._cleanup_thread()
+            state = self._states.get(thread_id)
+            if state is not None:
+                logger.info("[Process] Ending subreddit processing in thread %s (Active=%s, Transactions=%s)", thread_id, state.active, state.tx_count)
+                if not state.active:
+                    self._cleanup_thread()
+
+    def _process_subreddit(self, subreddit_name: str, listing: Future, pool: ThreadPoolExecutor) -> None:
+        """Post to and comment in one subreddit; runs on a subreddit worker thread.
+
+        Reddit and OpenAI calls happen outside transactions and each write is a
+        short transaction of its own, so subreddits processed in parallel only
+        hold the database write lock briefly. Posts are stored before any reply
+        is sent, so a post that was commented on is never picked up again.
+        """
+        logger.info("Processing subreddit: %s", subreddit_name)
+        
+        # One timestamp for every row written for this subreddit, pre-formatted
+        # the way the datetime adapter would store it
+        batch_ts = datetime.now().isoformat()
+        try:
+            with self.get_db_connection() as (conn, cursor):
+                # Comments posted in this subreddit, stored together at the end
+                comments_to_insert = []
+                try:
+                    self._post_and_comment(cursor, subreddit_name, listing, pool, comments_to_insert, batch_ts)
+                except sqlite3.Error:
+                    raise
+                except Exception as e:
+                    logger.error("Error processing subreddit %s: %s", subreddit_name, e, exc_info=True)
+                
+                # Record the comments posted so far, including before a failure
+                self._store_comments(cursor, comments_to_insert, batch_ts)
+                logger.debug("Committed changes for subreddit %s", subreddit_name)
+        except sqlite3.Error as e:
+            logger.error("Database error in subreddit %s: %s", subreddit_name, e, exc_info=True)
+        finally:
+            self._cleanup_thread()
+
+    def _post_and_comment(self, cursor, subreddit_name: str, listing: Future, pool: ThreadPoolExecutor,
+                          comments: List[Tuple[Dict, str, str, str]], timestamp: str) -> None:
+        """Submit a post and reply to new listed posts, appending posted comments to comments"""
+        subreddit = self.reddit.subreddit(subreddit_name)
+        logger.info("Successfully accessed subreddit: %s", subreddit_name)
+        
+        # Generate and submit a new post, at most one per subreddit per POST_INTERVAL
+        new_post = None
+        personality = None
+        if not self._posted_recently(cursor, subreddit_name):
+            personality = self.active_personality or self.personality_manager.get_random_personality('reddit')
+        else:
+            logger.info("Already posted to %s within POST_INTERVAL, skipping new post", subreddit_name)
+        if personality:
+            logger.info("Generating post as personality: %s", personality['name'])
+            post_content = generate_post_content(personality)
+            if post_content:
+                title = generate_title(post_content, personality)
+                flair_id = self._get_flair(subreddit_name)
+                
+                submission = subreddit.submit(title=title, selftext=post_content, flair_id=flair_id)
+                logger.info("Created new post: %s", submission.id)
+                # submit() returns a lazy submission whose author would be
+                # fetched on access; it is always the authenticated user
+                new_post = ('reddit', submission.id, self.username,
+                            subreddit_name, title, post_content, personality['name'],
+                            dumps({'name': personality['name'], 'style': personality['style']['post']}).decode(),
+                            timestamp)
+                # Record the post before anything else can fail, so
+                # _posted_recently sees it on the next cycle
+                self._store_posts(cursor, subreddit_name, new_post, [])
+                self._process_comments(submission, comments)
+        
+        # Process existing posts, checking which are already stored with one query
+        submissions = listing.result()
+        if new_post:
+            submissions = [s for s in submissions if s.id != new_post[1]]
+        new_submissions = []
+        if submissions:
+            placeholders = ','.join('?' * len(submissions))
+            cursor.execute(f"SELECT post_id FROM posts WHERE post_id IN ({placeholders})",
+                           [submission.id for submission in submissions])
+            seen_ids = {row[0] for row in cursor.fetchall()}
+            new_submissions = [s for s in submissions if s.id not in seen_ids]
+        
+        listed_rows = []
+        for listed in new_submissions:
+            logger.info("Processing new post: %s", listed.id)
+            try:
+                # author is None for deleted accounts
+                author = listed.author
+                listed_rows.append(('reddit', listed.id, author.name if author else None,
+                                    subreddit_name, listed.title, listed.selftext, timestamp))
+            except Exception as e:
+                logger.error("Error reading post %s: %s", listed.id, e, exc_info=True)
+        
+        # Commit the listed posts before replying to any of them
+        self._store_posts(cursor, subreddit_name, None, listed_rows)
+        
+        # Process comments for the stored posts: generate all comments
+        # concurrently, then post them in order
+        stored_ids = {row[1] for row in listed_rows}
+        drafts = [(listed, pool.submit(self._prepare_comment, listed))
+                  for listed in new_submissions if listed.id in stored_ids]
+        for listed, draft in drafts:
+            try:
+                prepared = draft.result()
+                if prepared:
+                    posted = self._post_comment(listed, *prepared)
+                    if posted:
+                        comments.append(posted)
+            except Exception as e:
+                logger.error("Error processing post %s: %s", listed.id, e, exc_info=True)
+
+    def _store_posts(self, cursor, subreddit_name: str, new_post: Optional[Tuple], listed_rows: List[Tuple]) -> None:
+        """Write one subreddit's new and listed posts in a single transaction"""
+        if not (new_post or listed_rows):
+            return
+        conn = cursor.connection
+        begin_immediate(conn)
+        try:
+            if new_post:
+                cursor.execute(self._SQL_INSERT_POST, new_post)
+            if listed_rows:
+                cursor.executemany(self._SQL_INSERT_LISTED_POST, listed_rows)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        if listed_rows:
+            logger.info("Stored %s new posts from %s", len(listed_rows), subreddit_name)
+
+    def _process_comments(self, submission: praw.models.Submission, comments: List,
+                          forced_personality: Dict = None) -> None:
+        """Comment on a submission, appending the posted comment to comments for _store_comments"""
+        prepared = self._prepare_comment(submission, forced_personality)
+        if prepared:
+            posted = self._post_comment(submission, *prepared)
+            if posted:
+                comments.append(posted)
+
+    def _prepare_comment(self, submission: praw.models.Submission,
+                         forced_personality: Dict = None) -> Optional[Tuple[Dict, str]]:
+        """Pick a personality and generate a comment for a submission.
+
+        Makes no database calls, so it can run on a worker thread.
 
-    def _process_comments(self, submission: praw.models.Submission, cursor, forced_personality: Dict = None) -> None:
-        """Process comments for a submission"""
+        Returns:
+            (personality, comment_text), or None if no comment should be posted
+        """
         # Use specified personality, active personality, or get a random one
         personality = forced_personality or self.active_personality or self.personality_manager.get_random_personality('reddit')
         if not personality:
-            return
+            return None
 
         # Check reply probability unless using forced personality
         if not forced_personality and not self._should_reply():
             logger.info("Skipping reply based on probability settings")
-            return
+            return None
 
-        # Generate and post comment
+        # Generate comment
         comment_text = self.generate_comment_content(personality, submission.title, submission.selftext)
         if not comment_text:
             logger.warning("Failed to generate comment content")
-            return
-        
+            return None
+        return personality, comment_text
+
+    def _personality_fk(self, cursor, personality: Dict) -> int:
+        """Return the personalities row id for a personality, creating it on first use.
+
+        Call it outside a transaction: the id is only cached once the row is
+        committed, since a rolled-back insert would leave the cache pointing
+        at a row that does not exist.
+        """
+        name = personality['name']
+        personality_id = self._personality_ids.get(name)
+        if personality_id is None:
+            cursor.execute(self._SQL_INSERT_PERSONALITY,
+                           (name, dumps(personality['style']['chat'])))
+            cursor.execute(self._SQL_SELECT_PERSONALITY_ID, (name,))
+            personality_id = cursor.fetchone()[0]
+            if not cursor.connection.in_transaction:
+                self._personality_ids[name] = personality_id
+        return personality_id
+
+    def _post_comment(self, submission: praw.models.Submission, personality: Dict,
+                      comment_text: str) -> Optional[Tuple[Dict, str, str, str]]:
+        """Reply to a submission with a generated comment.
+
+        Returns:
+            (personality, comment_id, post_id, comment_text) to pass to
+            _store_comments, or None if the reply failed
+        """
         try:
             # Add personality signature
             comment_text = f"*Insights from **{personality['name']}** - {personality['bio'][0]}*\n\n{comment_text}"
             comment = submission.reply(comment_text)
+            logger.info("Successfully posted comment as %s", personality['name'])
+            return personality, comment.id, submission.id, comment_text
             
-            # Store comment in database
-            now = datetime.now()
-            cursor.execute('''INSERT INTO comments 
-                            (platform, username, comment_id, post_id, comment_content, timestamp,
-                             personality_id, personality_context)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                         ('reddit', personality['name'], comment.id,
-                          submission.id, comment_text, now,
-                          personality['name'],
-                          json.dumps({'name': personality['name'], 'style': personality['style']['chat']})))
+        except Exception as e:
+            logger.error("Error posting comment: %s", e)
+            return None
+
+    def _store_comments(self, cursor, comments: List[Tuple[Dict, str, str, str]], timestamp: str) -> None:
+        """Record posted comments with one executemany and a single stats update"""
+        if not comments:
+            return
+        # Resolve personality ids in autocommit mode, before the write transaction
+        personality_fks = {personality['name']: self._personality_fk(cursor, personality)
+                           for personality, _, _, _ in comments}
+        conn = cursor.connection
+        begin_immediate(conn)
+        try:
+            rows = [('reddit', personality['name'], comment_id, post_id, comment_text, timestamp,
+                     personality['name'], personality_fks[personality['name']])
+                    for personality, comment_id, post_id, comment_text in comments]
+            cursor.executemany(self._SQL_INSERT_COMMENT, rows)
             
             # Update platform stats
-            cursor.execute('''UPDATE platform_stats 
-                            SET total_interactions = total_interactions + 1,
-                                last_activity = ?
-                            WHERE platform = 'reddit' ''',
-                         (now,))
-            
-            logger.info(f"Successfully posted comment as {personality['name']}")
-            
-        except Exception as e:
-            logger.error(f"Error posting comment: {str(e)}")
+            cursor.execute(self._SQL_BUMP_STATS, (len(rows), timestamp))
+            conn.commit()
+        except BaseException:
+            # Comment rows and the stats update are stored together or not at all
+            conn.rollback()
+            raise
 
     def _should_reply(self) -> bool:
         """Check if we should reply based on probability settings"""
-        import random
-        return random.random() < self.config['personality']['settings'].get('reply_probability', 0.7)
+        return _rng().random() < self._reply_probability
 
     def generate_comment_content(self, personality: Dict, title: str, content: str) -> Optional[str]:
         """Generate a comment based on personality and context"""
         try:
             base_prompt = self.personality_manager.get_personality_prompt(personality, 'reddit', is_reply=True)
-            enhanced_prompt = f"""
-{base_prompt}
-
-As {personality['name']}, engage thoughtfully with this Reddit post from your unique perspective.
-Write a natural, engaging response that adds value to the discussion.
-
-The post title: {title}
-The post content: {content}
-
-Remember:
-- You are {personality['name']}, {personality['bio'][0]}
-- Draw from your specific knowledge in: {', '.join(personality['knowledge'][:3])}
-- Maintain your characteristic style: {', '.join(personality['style']['chat'])}
-- Keep the response concise but informative
-"""
+            enhanced_prompt = _COMMENT_PROMPT_TEMPLATE.format_map({
+                'base_prompt': base_prompt,
+                'name': personality['name'],
+                'bio': personality['bio'][0],
+                'knowledge_head': personality['_knowledge_head'],
+                'style_chat': personality['_style_chat'],
+                'title': title,
+                'content': content
+            })
             return get_openai_response(enhanced_prompt)
         except Exception as e:
-            logger.error(f"Error generating comment content: {str(e)}")
+            logger.error("Error generating comment content: %s", e)
             return None
 
     def get_platform_stats(self) -> Dict:
         """Get platform statistics"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
+        with self.get_db_connection() as (conn, c):
             c.execute('''SELECT total_interactions, last_activity 
                         FROM platform_stats 
                         WHERE platform = 'reddit' ''')
@@ -390,60 +629,77 @@ Remember:
                     'last_activity': result[1]
                 }
             return {'total_interactions': 0, 'last_activity': None}
-        finally:
-            conn.close()
 
-    def get_recent_activity(self, limit: int = 10) -> List[Dict]:
-        """Get recent platform activity"""
-        conn = init_db_connection(self.db_path)
-        c = conn.cursor()
-        
-        try:
-            # Verify table schemas before query
-            logger.info("Verifying table schemas before query...")
-            c.execute("PRAGMA table_info(posts)")
-            posts_columns = [col[1] for col in c.fetchall()]
-            logger.info(f"Posts table columns: {posts_columns}")
-            
-            c.execute("PRAGMA table_info(comments)")
-            comments_columns = [col[1] for col in c.fetchall()]
-            logger.info(f"Comments table columns: {comments_columns}")
-            
-            # Get recent posts and their associated comments
-            query = '''SELECT p.post_id, p.username, p.subreddit, p.post_title,
-                             p.personality_id, p.personality_context,
-                             c.comment_id, c.comment_content, c.timestamp
-                      FROM posts p
-                      LEFT JOIN comments c ON p.post_id = c.post_id
-                      WHERE p.platform = 'reddit'
-                      ORDER BY COALESCE(c.timestamp, p.timestamp) DESC
-                      LIMIT ?'''
-            logger.info(f"Executing query: {query}")
+    @staticmethod
+    def _iter_activities(rows: List[sqlite3.Row]) -> Iterator[Dict]:
+        """Yield activity dicts for get_recent_activity rows, decoding as they are read"""
+        # Each referenced personality's style is decoded once per call
+        comment_contexts = {}
+        for row in rows:
+            fk = row['personality_fk']
+            if fk is not None and fk not in comment_contexts and row['style_json'] is not None:
+                comment_contexts[fk] = {'name': row['comment_personality'], 'style': loads(row['style_json'])}
             
-            c.execute(query, (limit,))
-            rows = c.fetchall()
-            logger.info(f"Query returned {len(rows)} rows")
+            activity = {
+                'post_id': row['post_id'],
+                'username': row['username'],
+                'subreddit': row['subreddit'],
+                'title': row['post_title'],
+                'personality_id': row['personality_id'],
+                'personality_context': loads(row['personality_context']) if row['personality_context'] else None,
+                'comment_id': row['comment_id'],
+                'comment_content': row['comment_content'],
+                'comment_personality_context': comment_contexts.get(fk),
+                'timestamp': row['timestamp']
+            }
+            logger.debug("Processed activity: %s", activity)
+            yield activity
+
+    def get_recent_activity(self, limit: int = 10) -> Iterator[Dict]:
+        """Get recent platform activity.
+
+        The rows are fetched up front, but their JSON columns are decoded
+        lazily as the returned iterator is consumed.
+        """
+        try:
+            with self.get_db_connection() as (conn, _):
+                # A cursor of our own, so the Row factory doesn't leak into the shared one
+                c = conn.cursor()
+                c.row_factory = sqlite3.Row
+                
+                # Log the table schemas once per process, and only when debugging
+                if not RedditHandler._schema_logged and logger.isEnabledFor(logging.DEBUG):
+                    c.execute("PRAGMA table_info(posts)")
+                    logger.debug("Posts table columns: %s", [col[1] for col in c.fetchall()])
+                    c.execute("PRAGMA table_info(comments)")
+                    logger.debug("Comments table columns: %s", [col[1] for col in c.fetchall()])
+                    RedditHandler._schema_logged = True
             
-            activities = []
-            for row in rows:
-                activity = {
-                    'post_id': row[0],
-                    'username': row[1],
-                    'subreddit': row[2],
-                    'title': row[3],
-                    'personality_id': row[4],
-                    'personality_context': json.loads(row[5]) if row[5] else None,
-                    'comment_id': row[6],
-                    'comment_content': row[7],
-                    'timestamp': row[8]
-                }
-                activities.append(activity)
-                logger.debug(f"Processed activity: {activity}")
+                # Get the most recent posts first (served by idx_posts_platform_ts),
+                # then join only their comments
+                query = '''WITH recent_posts AS (
+                              SELECT post_id, username, subreddit, post_title,
+                                     personality_id, personality_context, timestamp
+                              FROM posts
+                              WHERE platform = 'reddit'
+                              ORDER BY timestamp DESC
+                              LIMIT ?)
+                          SELECT p.post_id, p.username, p.subreddit, p.post_title,
+                                 p.personality_id, p.personality_context,
+                                 c.comment_id, c.comment_content, c.timestamp,
+                                 c.personality_fk, pe.name AS comment_personality, pe.style_json
+                          FROM recent_posts p
+                          LEFT JOIN comments c ON p.post_id = c.post_id
+                          LEFT JOIN personalities pe ON c.personality_fk = pe.id
+                          ORDER BY COALESCE(c.timestamp, p.timestamp) DESC
+                          LIMIT ?'''
+
+                c.execute(query, (limit, limit))
+                rows = c.fetchall()
+                logger.info("Query returned %s rows", len(rows))
             
-            return activities
+                return self._iter_activities(rows)
         except Exception as e:
-            logger.error(f"Error in get_recent_activity: {str(e)}")
-            logger.error(f"Database path: {self.db_path}")
-            raise
-        finally:
-            conn.close() 
\ No newline at end of file
+            logger.error("Error in get_recent_activity: %s", e)
+            logger.error("Database path: %s", self.db_path)
+            raise 
\ No newline at end of file
@@ -28,7 +28,7 @@ Avoid listing points or numbered sections. Instead, present your thoughts in a f
 Remember:
 - You are {personality['name']}, {personality['bio'][0]}
 - Draw from your specific knowledge in: {', '.join(personality['knowledge'])}
-- Maintain your characteristic style: {', '.join(personality['style']['post'])}
+- Maintain your characteristic style: {personality['_style_post']}
 - Write as if you're sharing valuable insights with peers in your field
 """
         content = get_openai_response(enhanced_prompt)
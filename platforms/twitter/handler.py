@@ -1,28 +1,73 @@
 """Twitter Platform Handler"""
 
 import os
+import sys
+import base64
 import json
 import time
 import logging
+import threading
+import subprocess
+from collections import deque
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 import random
 
-from utils.db_utils import init_db_connection
+from utils.db_utils import init_db_connection, begin_immediate
+from utils.json_utils import load_json, write_json
 from utils.personality_manager import PersonalityManager
 from utils.openai_utils import get_openai_response
 from .tweet import Tweet
 
 logger = logging.getLogger(__name__)
 
+# Requests the bot has no use for; blocked through CDP in every browser session
+BLOCKED_URL_PATTERNS = (
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.mp4',
+    '*.woff', '*.woff2', '*google-analytics*', '*doubleclick*', '*/ads/*'
+)
+
+# Returns [index, element] for the first of arguments[0] ([by, selector] pairs)
+# present in the page, or null. With arguments[1] set, the element must also
+# be visible and not aria-disabled, mirroring EC.element_to_be_clickable
+_PROBE_SELECTORS_JS = """
+const [locators, clickable] = arguments;
+for (let i = 0; i < locators.length; i++) {
+    const [by, selector] = locators[i];
+    const el = by === 'xpath'
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    if (el && (!clickable || (el.offsetParent !== null && el.getAttribute('aria-disabled') !== 'true'))) {
+        return [i, el];
+    }
+}
+return null;
+"""
+
+# Tweet ID (first token of aria-labelledby) and text of every rendered tweet
+# article; articles without a text element are skipped
+_EXTRACT_TWEETS_JS = """
+return Array.from(document.querySelectorAll("article[data-testid='tweet']"))
+    .map(article => [article, article.querySelector("div[data-testid='tweetText']")])
+    .filter(([, text]) => text !== null)
+    .map(([article, text]) => ({
+        id: (article.getAttribute('aria-labelledby') || '').split(' ')[0],
+        content: text.innerText
+    }));
+"""
+
+# Remembers which compose button selector matched, across runs
+SELECTOR_CACHE_PATH = os.path.join("debug_twitter", "selector_cache.json")
+
 # Add diagnostic logging for imports
 def _check_dependency(module_name: str):
     try:
@@ -33,42 +78,146 @@ def _check_dependency(module_name: str):
         logger.error(f"Failed to import {module_name}: {str(e)}")
         return False
 
+@lru_cache(maxsize=1)
+def _preflight() -> None:
+    """Check dependencies and log the environment once per process.
+
+    Raises ImportError when a dependency is missing; since lru_cache does
+    not cache exceptions, the check runs again on the next handler.
+    """
+    # Check dependencies before proceeding
+    logger.info("Checking critical dependencies...")
+    dependencies = [
+        'selenium',
+        'webdriver_manager',
+        'psutil',
+        'openai'
+    ]
+    missing_deps = [dep for dep in dependencies if not _check_dependency(dep)]
+    if missing_deps:
+        raise ImportError(f"Missing required dependencies: {', '.join(missing_deps)}")
+    
+    # Log Python version and environment
+    logger.info(f"Python version: {sys.version}")
+    logger.info(f"Operating system: {sys.platform}")
+    
+    # Log environment variables (safely)
+    logger.info("Environment variable check:")
+    env_vars = ['TWITTER_USERNAME', 'TWITTER_PASSWORD', 'TWITTER_EMAIL', 'TWITTER_DRY_RUN']
+    for var in env_vars:
+        logger.info(f"{var} is {'set' if os.getenv(var) else 'not set'}")
+    
+    # Log current working directory and permissions
+    logger.info(f"Current working directory: {os.getcwd()}")
+    try:
+        logger.info(f"Current directory permissions: {oct(os.stat('.').st_mode)[-3:]}")
+    except Exception as e:
+        logger.error(f"Failed to get directory permissions: {str(e)}")
+
+@lru_cache(maxsize=None)
+def _resolve_chrome_version() -> Optional[str]:
+    """Read the installed Chrome version once per process"""
+    try:
+        chrome_path = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+        chrome_version = subprocess.check_output([chrome_path, '--version']).decode('utf-8').strip()
+        return chrome_version.split()[-1]  # Get just the version number
+    except Exception as e:
+        logger.error(f"Failed to get Chrome version: {str(e)}")
+        return None
+
+@lru_cache(maxsize=None)
+def _resolve_chromedriver() -> str:
+    """Install or locate ChromeDriver once per process; failures are not cached"""
+    return ChromeDriverManager().install()
+
+def _backoff_sleep(attempt: int, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5):
+    """Sleep before a retry: exponential in attempt, capped, with up to jitter x extra"""
+    time.sleep(min(cap, base * (2 ** attempt)) * (1 + random.uniform(0, jitter)))
+
+def _first_clickable(locators):
+    """Wait condition returning (locator, element) for the first clickable locator.
+
+    Every locator is checked on each poll, like EC.any_of, but the caller
+    also learns which one matched.
+    """
+    def condition(driver):
+        for locator in locators:
+            try:
+                element = EC.element_to_be_clickable(locator)(driver)
+            except WebDriverException:
+                continue
+            if element:
+                return locator, element
+        return False
+    return condition
+
 class TwitterHandler:
     """Handler for Twitter platform interactions"""
     
+    _SQL_INSERT_INTERACTION = '''INSERT INTO tweet_interactions
+                                 (tweet_id, interaction_type, username, personality_id, personality_context, timestamp)
+                                 VALUES (?, ?, ?, ?, ?, ?)'''
+    _SQL_BUMP_REPLY_STATS = '''INSERT INTO personality_stats
+                               (personality_id, total_replies, last_reply_time)
+                               VALUES (?, 1, ?)
+                               ON CONFLICT(personality_id)
+                               DO UPDATE SET
+                                   total_replies = total_replies + 1,
+                                   last_reply_time = excluded.last_reply_time'''
+    
+    # Candidate locators for the compose button, in order of preference
+    _COMPOSE_SELECTORS = (
+        (By.CSS_SELECTOR, "a[href='/compose/tweet']"),
+        (By.CSS_SELECTOR, "a[href='/compose/post']"),
+        (By.CSS_SELECTOR, "div[aria-label='Post']"),
+        (By.CSS_SELECTOR, "div[aria-label='Tweet']"),
+        (By.XPATH, "//span[text()='Post']"),
+        (By.XPATH, "//span[text()='Tweet']"),
+        # Additional selectors for the blue compose button
+        (By.CSS_SELECTOR, "div[data-testid='SideNav_NewTweet_Button']"),
+        (By.CSS_SELECTOR, "a[data-testid='SideNav_NewTweet_Button']"),
+        (By.CSS_SELECTOR, "div[aria-label='New post']"),
+        (By.CSS_SELECTOR, "div[aria-label='New tweet']")
+    )
+    
+    # Candidate locators for the tweet text input
+    _INPUT_SELECTORS = (
+        (By.CSS_SELECTOR, "div[role='textbox'][contenteditable='true']"),
+        (By.CSS_SELECTOR, "div[data-testid='tweetTextarea_0']"),
+        (By.CSS_SELECTOR, "div[aria-label='Post text']"),
+        (By.CSS_SELECTOR, "div[aria-label='Tweet text']"),
+        # Additional backup selectors
+        (By.CSS_SELECTOR, "div.public-DraftEditor-content[contenteditable='true']"),
+        (By.CSS_SELECTOR, "div[data-contents='true']")
+    )
+    
+    # Candidate locators for the post button
+    _POST_SELECTORS = (
+        (By.CSS_SELECTOR, "div[data-testid='tweetButtonInline']"),
+        (By.CSS_SELECTOR, "div[data-testid='postButtonInline']"),
+        (By.XPATH, "//span[text()='Post']"),
+        (By.XPATH, "//span[text()='Tweet']"),
+        # Additional backup selectors
+        (By.CSS_SELECTOR, "div[data-testid='tweetButton']"),
+        (By.CSS_SELECTOR, "div[data-testid='postButton']"),
+        (By.CSS_SELECTOR, "div[role='button'][data-testid*='tweet']"),
+        (By.CSS_SELECTOR, "div[role='button'][data-testid*='post']")
+    )
+    
+    # Elements that carry the ID of a just-posted tweet
+    _TWEET_ID_SELECTORS = (
+        (By.CSS_SELECTOR, "a[href*='/status/']"),
+        (By.CSS_SELECTOR, "a[href*='/posts/']"),
+        (By.CSS_SELECTOR, "div[data-testid='tweet']"),
+        (By.CSS_SELECTOR, "article[data-testid='tweet']"),
+        (By.CSS_SELECTOR, "div[data-testid='post']"),
+        (By.CSS_SELECTOR, "article[data-testid='post']")
+    )
+    
     def __init__(self, personality_manager: PersonalityManager, config_path: str = "config.json"):
         """Initialize Twitter handler"""
         logger.info("Initializing Twitter handler")
-        
-        # Check dependencies before proceeding
-        logger.info("Checking critical dependencies...")
-        dependencies = [
-            'selenium',
-            'webdriver_manager',
-            'psutil',
-            'openai'
-        ]
-        missing_deps = [dep for dep in dependencies if not _check_dependency(dep)]
-        if missing_deps:
-            raise ImportError(f"Missing required dependencies: {', '.join(missing_deps)}")
-        
-        # Log Python version and environment
-        import sys
-        logger.info(f"Python version: {sys.version}")
-        logger.info(f"Operating system: {sys.platform}")
-        
-        # Log environment variables (safely)
-        logger.info("Environment variable check:")
-        env_vars = ['TWITTER_USERNAME', 'TWITTER_PASSWORD', 'TWITTER_EMAIL', 'TWITTER_DRY_RUN']
-        for var in env_vars:
-            logger.info(f"{var} is {'set' if os.getenv(var) else 'not set'}")
-        
-        # Log current working directory and permissions
-        logger.info(f"Current working directory: {os.getcwd()}")
-        try:
-            logger.info(f"Current directory permissions: {oct(os.stat('.').st_mode)[-3:]}")
-        except Exception as e:
-            logger.error(f"Failed to get directory permissions: {str(e)}")
+        _preflight()
         
         try:
             self.config = self._load_config(config_path)
@@ -83,32 +232,23 @@ class TwitterHandler:
         self.db_path = os.getenv("DB_PATH", self.config['global_settings']['database']['path'])
         self.last_tweet_time = None
         self.last_reply_time = None
-        self.dry_run = os.getenv('TWITTER_DRY_RUN', str(self.config['global_settings']['dry_run'])).lower() == 'true'
-        
-        # Load active personality
-        self.active_personality = None
-        self._load_active_personality()
+        self._compose_selector = self._load_compose_selector()
+        self._prompt_cache = {}  # (name, mode) -> (base prompt, (prefix, suffix))
+        self._debug_ring = deque(maxlen=8)  # (stage, time, url, page source) awaiting _flush_debug_info
+        self.apply_config(self.config)
         
         if self.dry_run:
             logger.info("Running in DRY RUN mode - no actual tweets will be posted")
         
+        # One connection for the handler's lifetime. The bot calls into the handler
+        # from asyncio.to_thread workers, so access is serialized with a lock
+        self._db = init_db_connection(self.db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        
         # Initialize database tables
         self._init_db()
         
         try:
-            # Log environment variables (without sensitive data)
-            env_vars = {
-                'TWITTER_USERNAME': bool(os.getenv('TWITTER_USERNAME')),
-                'TWITTER_PASSWORD': bool(os.getenv('TWITTER_PASSWORD')),
-                'TWITTER_EMAIL': bool(os.getenv('TWITTER_EMAIL'))
-            }
-            logger.info(f"Environment variables present: {env_vars}")
-            
-            # Check for existing Chrome processes
-            import psutil
-            chrome_processes = [p for p in psutil.process_iter(['name']) if 'chrome' in p.info['name'].lower()]
-            logger.info(f"Existing Chrome processes: {len(chrome_processes)}")
-            
             # Initialize browser session
             logger.info("Starting browser initialization...")
             self.driver = self._init_browser()
@@ -129,11 +269,25 @@ class TwitterHandler:
                     # Get any available browser logs
                     logs = self.driver.get_log('browser')
                     logger.error(f"Browser logs before quit:\n{logs}")
-                except:
+                except WebDriverException:
                     pass
-                self.driver.quit()
+                self.close()
             raise
 
+    def apply_config(self, config: Dict):
+        """Adopt a config and the settings derived from it, keeping the browser session.
+
+        Browser launch settings (headless, profile_dir, kill_existing_chrome)
+        and the database path only take effect when the handler is recreated.
+        """
+        self.config = config
+        self.simulate_human_typing = config['platforms']['twitter'].get('simulate_human_typing', False)
+        self.dry_run = os.getenv('TWITTER_DRY_RUN', str(config['global_settings']['dry_run'])).lower() == 'true'
+        
+        # Load active personality
+        self.active_personality = None
+        self._load_active_personality()
+
     def _load_active_personality(self):
         """Load the active personality from config"""
         try:
@@ -153,27 +307,19 @@ class TwitterHandler:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from file"""
         logger.debug(f"Loading config from {config_path}")
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return load_json(config_path)
 
     def _init_browser(self) -> webdriver.Chrome:
         """Initialize Chrome browser with enhanced anti-detection measures"""
         try:
             # Get Chrome version first
-            chrome_version = None
-            try:
-                import subprocess
-                chrome_path = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
-                chrome_version = subprocess.check_output([chrome_path, '--version']).decode('utf-8').strip()
-                chrome_version = chrome_version.split()[-1]  # Get just the version number
+            chrome_version = _resolve_chrome_version()
+            if chrome_version:
                 logger.info(f"Chrome version: {chrome_version}")
-            except Exception as e:
-                logger.error(f"Failed to get Chrome version: {str(e)}")
 
             # Initialize ChromeDriver with specific version
             try:
-                from webdriver_manager.chrome import ChromeDriverManager
-                chromedriver_path = ChromeDriverManager().install()
+                chromedriver_path = _resolve_chromedriver()
                 logger.info(f"ChromeDriver path: {chromedriver_path}")
             except Exception as e:
                 logger.error(f"Failed to get ChromeDriver: {str(e)}")
@@ -181,23 +327,28 @@ class TwitterHandler:
 
             # Log system resources
             import psutil
-            process = psutil.Process()
-            logger.info(f"Current process memory usage: {process.memory_info().rss / 1024 / 1024:.2f} MB")
-            logger.info(f"Current process CPU usage: {process.cpu_percent()}%")
-            logger.info(f"System memory available: {psutil.virtual_memory().available / 1024 / 1024:.2f} MB")
+            if logger.isEnabledFor(logging.DEBUG):
+                process = psutil.Process()
+                logger.debug(f"Current process memory usage: {process.memory_info().rss / 1024 / 1024:.2f} MB")
+                logger.debug(f"Current process CPU usage: {process.cpu_percent()}%")
+                logger.debug(f"System memory available: {psutil.virtual_memory().available / 1024 / 1024:.2f} MB")
 
-            # Clean up existing Chrome processes
-            try:
-                for proc in psutil.process_iter(['name']):
-                    if 'chrome' in proc.info['name'].lower():
-                        try:
-                            proc.terminate()
-                            logger.info(f"Terminated existing Chrome process: {proc.pid}")
-                        except:
-                            pass
-                time.sleep(2)  # Wait for processes to clean up
-            except Exception as e:
-                logger.error(f"Failed to clean up Chrome processes: {str(e)}")
+            # Clean up existing Chrome processes; opt-in, since it also kills the user's own browser
+            if self.config['platforms']['twitter'].get('kill_existing_chrome', False):
+                try:
+                    terminated = []
+                    for proc in psutil.process_iter(['name']):
+                        if 'chrome' in (proc.info['name'] or '').lower():
+                            try:
+                                proc.terminate()
+                                terminated.append(proc)
+                                logger.info(f"Terminated existing Chrome process: {proc.pid}")
+                            except psutil.Error:
+                                pass
+                    # Returns as soon as they have all exited, or after 2s
+                    psutil.wait_procs(terminated, timeout=2)
+                except Exception as e:
+                    logger.error(f"Failed to clean up Chrome processes: {str(e)}")
 
             chrome_options = Options()
             
@@ -222,12 +373,13 @@ class TwitterHandler:
             chrome_options.add_argument('--disable-web-security')
             
             # Performance improvements
+            if self.config['platforms']['twitter'].get('headless', True):
+                chrome_options.add_argument('--headless=new')
             chrome_options.add_argument('--disable-gpu')
             chrome_options.add_argument('--disable-software-rasterizer')
             
-            # Mimic real browser behavior
+            # Mimic real browser behavior; a fixed window size keeps the layout deterministic
             chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--start-maximized')
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-popup-blocking')
             chrome_options.add_argument('--disable-notifications')
@@ -239,10 +391,16 @@ class TwitterHandler:
             chrome_options.add_argument('--lang=en-US')
             chrome_options.add_argument('--accept-lang=en-US')
             
+            # Persistent profile so cookies and login tokens survive restarts
+            profile_dir = self.config['platforms']['twitter'].get('profile_dir')
+            if profile_dir:
+                chrome_options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+            
             # Log all Chrome flags being used
-            logger.info("Chrome flags being used:")
-            for arg in chrome_options.arguments:
-                logger.info(f"  {arg}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Chrome flags being used:")
+                for arg in chrome_options.arguments:
+                    logger.debug(f"  {arg}")
             
             # Create service with specific executable path
             service = Service(executable_path=chromedriver_path)
@@ -254,17 +412,23 @@ class TwitterHandler:
             # Add performance logging
             chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
             
+            # Return from driver.get at DOMContentLoaded rather than waiting for every
+            # image and script; callers wait explicitly for the elements they need
+            chrome_options.page_load_strategy = 'eager'
+            
             driver = webdriver.Chrome(service=service, options=chrome_options)
             
-            # Set connection and page load timeouts
-            driver.set_page_load_timeout(30)
-            driver.implicitly_wait(10)
+            # Set connection and page load timeouts. No implicit wait: every
+            # lookup uses an explicit WebDriverWait, and an implicit wait would
+            # stall each failed probe inside those waits as well
+            driver.set_page_load_timeout(15)
             
             # Set window size
             driver.set_window_size(1920, 1080)
             
             # Execute stealth scripts
             self._apply_stealth_scripts(driver)
+            self._block_heavy_resources(driver)
             
             # Verify driver is responsive
             try:
@@ -302,7 +466,7 @@ class TwitterHandler:
                 "acceptLanguage": "en-US,en;q=0.9"
             })
             
-            # Execute stealth scripts
+            # Stealth scripts
             stealth_scripts = [
                 # Remove webdriver property
                 "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });",
@@ -381,35 +545,52 @@ class TwitterHandler:
                 """
             ]
             
-            for script in stealth_scripts:
-                driver.execute_script(script)
+            # Register them as one script that Chrome runs before any page script
+            # on every new document, so they survive driver.get navigations
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': '\n;'.join(stealth_scripts)
+            })
                 
         except Exception as e:
             logger.error(f"Failed to apply stealth scripts: {str(e)}")
 
+    def _block_heavy_resources(self, driver: webdriver.Chrome):
+        """Stop Chrome from fetching media, fonts and trackers the bot never looks at"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(BLOCKED_URL_PATTERNS)})
+            # Keep the HTTP cache for the scripts and styles that are still loaded
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+        except Exception as e:
+            logger.error(f"Failed to set blocked URLs: {str(e)}")
+
     def _add_random_delay(self, min_delay: float = 0.5, max_delay: float = 2.0):
-        """Add a random delay to simulate human behavior"""
+        """Add a random delay to simulate human behavior.
+
+        A no-op in dry-run mode or when platforms.twitter.humanize is false.
+        """
+        if self.dry_run or not self.config['platforms']['twitter'].get('humanize', True):
+            return
         delay = random.uniform(min_delay, max_delay)
         time.sleep(delay)
 
     def _init_db(self):
         """Initialize database tables for Twitter"""
-        conn = init_db_connection(self.db_path)
-        try:
-            c = conn.cursor()
-            
-            # Create tweets table
-            c.execute('''CREATE TABLE IF NOT EXISTS tweets
+        with self._db_lock:
+            # All DDL in one executescript call
+            self._db.executescript('''
+                -- Create tweets table
+                CREATE TABLE IF NOT EXISTS tweets
                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
                          tweet_id TEXT UNIQUE,
                          content TEXT,
                          username TEXT,
                          personality_id TEXT,
                          personality_context TEXT,  -- JSON string of personality context
-                         timestamp DATETIME)''')
-            
-            # Create interactions table
-            c.execute('''CREATE TABLE IF NOT EXISTS tweet_interactions
+                         timestamp DATETIME);
+                
+                -- Create interactions table
+                CREATE TABLE IF NOT EXISTS tweet_interactions
                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
                          tweet_id TEXT,
                          interaction_type TEXT,
@@ -417,20 +598,22 @@ class TwitterHandler:
                          personality_id TEXT,
                          personality_context TEXT,  -- JSON string of personality context
                          timestamp DATETIME,
-                         FOREIGN KEY(tweet_id) REFERENCES tweets(tweet_id))''')
-            
-            # Create personality stats table
-            c.execute('''CREATE TABLE IF NOT EXISTS personality_stats
+                         FOREIGN KEY(tweet_id) REFERENCES tweets(tweet_id));
+                
+                -- Interactions are looked up by the tweet they belong to;
+                -- tweets.tweet_id is already indexed by its UNIQUE constraint
+                CREATE INDEX IF NOT EXISTS idx_tweet_interactions_tweet_id
+                        ON tweet_interactions(tweet_id);
+                
+                -- Create personality stats table
+                CREATE TABLE IF NOT EXISTS personality_stats
                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
                          personality_id TEXT UNIQUE,
                          total_tweets INTEGER DEFAULT 0,
                          total_replies INTEGER DEFAULT 0,
                          last_tweet_time DATETIME,
-                         last_reply_time DATETIME)''')
-            
-            conn.commit()
-        finally:
-            conn.close()
+                         last_reply_time DATETIME);
+            ''')
 
     def _login(self):
         """Login to Twitter using credentials"""
@@ -446,18 +629,19 @@ class TwitterHandler:
                 logger.info("DRY RUN: Would have logged in with credentials")
                 return
 
+            if self._has_session():
+                logger.info("Reusing authenticated session from the browser profile")
+                return
+
             # Navigate to Twitter login
             self.driver.get('https://twitter.com/i/flow/login')
             logger.info("Navigated to Twitter login page")
             
-            # Wait for login form
-            time.sleep(5)  # Give page time to fully load
-            
-            # Enter username
+            # Enter username once the login form has rendered
             username_input = WebDriverWait(self.driver, 15).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[autocomplete='username']"))
             )
-            username_input.send_keys(username)
+            self._insert_text(username_input, username)
             logger.info("Entered username")
             
             # Click next
@@ -465,27 +649,26 @@ class TwitterHandler:
                 EC.element_to_be_clickable((By.XPATH, "//span[text()='Next']"))
             )
             next_button.click()
-            time.sleep(3)
             
-            # Handle possible email verification
-            try:
-                email_input = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[autocomplete='email']"))
-                )
-                email_input.send_keys(email)
+            # The next step is either an email verification or the password prompt
+            step_input = WebDriverWait(self.driver, 10).until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[autocomplete='email']")),
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
+            ))
+            if step_input.get_attribute('type') != 'password':
+                self._insert_text(step_input, email)
                 next_button = WebDriverWait(self.driver, 5).until(
                     EC.element_to_be_clickable((By.XPATH, "//span[text()='Next']"))
                 )
                 next_button.click()
-                time.sleep(3)
-            except TimeoutException:
+            else:
                 logger.info("No email verification required")
             
             # Enter password
             password_input = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
             )
-            password_input.send_keys(password)
+            self._insert_text(password_input, password)
             
             # Click login
             login_button = WebDriverWait(self.driver, 10).until(
@@ -507,6 +690,22 @@ class TwitterHandler:
                 logger.info("Saved error screenshot to twitter_login_error.png")
             raise
 
+    def _insert_text(self, element, text: str):
+        """Type text into an input with one CDP call instead of a key event per character"""
+        self.driver.execute_script("arguments[0].focus();", element)
+        self.driver.execute_cdp_cmd('Input.insertText', {'text': text})
+
+    def _has_session(self) -> bool:
+        """Check whether the browser profile is already logged in to Twitter"""
+        self.driver.get('https://twitter.com/home')
+        try:
+            WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-testid='primaryColumn']"))
+            )
+            return True
+        except TimeoutException:
+            return False
+
     def _check_rate_limit(self, action_type: str) -> bool:
         """Check if action is within rate limits"""
         rate_limits = self.config['platforms']['twitter']['rate_limits']
@@ -522,26 +721,92 @@ class TwitterHandler:
         
         return True
 
+    def _probe_selectors(self, locators, timeout: float, clickable: bool = False):
+        """Wait for the first of several locators to match, checking all of them in one script.
+
+        Each poll is a single execute_script round trip rather than one
+        WebDriver lookup per locator.
+
+        Returns:
+            (locator, element) for the first match in preference order, or None on timeout
+        """
+        locators = list(locators)
+        
+        def probe(driver):
+            found = driver.execute_script(_PROBE_SELECTORS_JS, [list(l) for l in locators], clickable)
+            return (locators[found[0]], found[1]) if found else False
+        
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(probe)
+        except TimeoutException:
+            return None
+
+    def _load_compose_selector(self) -> Optional[Tuple[str, str]]:
+        """Load the compose button selector that worked in a previous run"""
+        try:
+            selector = load_json(SELECTOR_CACHE_PATH).get('compose')
+            return tuple(selector) if selector else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _remember_compose_selector(self, selector: Tuple[str, str]):
+        """Try this compose selector first from now on, in this run and the next"""
+        self._compose_selector = selector
+        try:
+            os.makedirs(os.path.dirname(SELECTOR_CACHE_PATH), exist_ok=True)
+            write_json(SELECTOR_CACHE_PATH, {'compose': list(selector)})
+        except OSError as e:
+            logger.warning(f"Failed to save selector cache: {str(e)}")
+
     def _save_debug_info(self, stage: str):
-        """Save debug information at various stages"""
+        """Record debug information for a stage of post_tweet.
+
+        The URL and page source are buffered in memory and only written to
+        disk by _flush_debug_info once posting has failed for good, so a
+        retry that then succeeds costs no screenshot or disk I/O. With
+        DEBUG logging enabled every stage is written straight away.
+        """
+        try:
+            entry = (stage, datetime.now(), self.driver.current_url, self.driver.page_source)
+        except WebDriverException as e:
+            logger.error(f"Failed to save debug info: {str(e)}")
+            return
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            self._write_debug_info(*entry, screenshot=True)
+        else:
+            self._debug_ring.append(entry)
+
+    def _flush_debug_info(self):
+        """Write out the buffered debug stages, plus a screenshot of the final page"""
+        entries = list(self._debug_ring)
+        self._debug_ring.clear()
+        for i, entry in enumerate(entries):
+            self._write_debug_info(*entry, screenshot=(i == len(entries) - 1))
+
+    def _write_debug_info(self, stage: str, when: datetime, url: str, page_source: str, screenshot: bool = False):
+        """Write one stage's page source, and optionally a screenshot of the current page"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = when.strftime("%Y%m%d_%H%M%S")
             debug_dir = "debug_twitter"
             os.makedirs(debug_dir, exist_ok=True)
             
-            # Save screenshot
-            screenshot_path = f"{debug_dir}/{stage}_{timestamp}.png"
-            self.driver.save_screenshot(screenshot_path)
-            logger.info(f"Saved screenshot to {screenshot_path}")
+            # Save screenshot; a JPEG is a fraction of the size of save_screenshot's PNG
+            if screenshot:
+                screenshot_path = f"{debug_dir}/{stage}_{timestamp}.jpg"
+                data = self.driver.execute_cdp_cmd('Page.captureScreenshot', {'format': 'jpeg', 'quality': 60})
+                with open(screenshot_path, 'wb') as f:
+                    f.write(base64.b64decode(data['data']))
+                logger.info(f"Saved screenshot to {screenshot_path}")
             
             # Save page source
             source_path = f"{debug_dir}/{stage}_{timestamp}.html"
             with open(source_path, 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
+                f.write(page_source)
             logger.info(f"Saved page source to {source_path}")
             
             # Save current URL
-            logger.info(f"Current URL: {self.driver.current_url}")
+            logger.info(f"Current URL: {url}")
             
         except Exception as e:
             logger.error(f"Failed to save debug info: {str(e)}")
@@ -552,22 +817,32 @@ class TwitterHandler:
             logger.warning("Rate limit exceeded for tweets")
             return None
 
+        if self.dry_run:
+            logger.info(f"DRY RUN: Would have posted tweet: {content}")
+            return f"dry_run_tweet_{datetime.now().timestamp()}"
+
         max_retries = 3
         retry_count = 0
+        # Debug stages from an earlier call are of no use for this one
+        self._debug_ring.clear()
         
         while retry_count < max_retries:
+            if retry_count:
+                _backoff_sleep(retry_count - 1)
             try:
                 # Add initial random delay
                 self._add_random_delay(1.0, 3.0)
                 
                 # Log browser state
                 logger.info(f"Current URL before posting: {self.driver.current_url}")
-                self._save_debug_info("before_post")
+                if logger.isEnabledFor(logging.DEBUG):
+                    self._save_debug_info("before_post")
                 
                 # Check if we're still logged in
                 if "login" in self.driver.current_url.lower():
                     logger.error("Session appears to have expired, detected login page")
                     self._save_debug_info("login_expired")
+                    self._flush_debug_info()
                     return None
 
                 # Navigate to home first (more natural)
@@ -582,50 +857,47 @@ class TwitterHandler:
                         self.base_url = "https://x.com"
                     else:
                         self.base_url = "https://twitter.com"
-                    self._save_debug_info("home_page")
-                except:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("home_page")
+                except WebDriverException:
                     logger.info("Falling back to x.com...")
                     self.driver.get('https://x.com/home')
                     self._add_random_delay(2.0, 4.0)
                     self.base_url = "https://x.com"
-                    self._save_debug_info("x_home_page")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("x_home_page")
 
                 # Verify page loaded correctly
                 try:
                     WebDriverWait(self.driver, 10).until(
                         lambda x: "home" in x.current_url.lower()
                     )
-                except:
+                except WebDriverException:
                     logger.error("Failed to load home page")
                     self._save_debug_info("home_page_failed")
                     retry_count += 1
                     continue
 
-                # Try multiple compose button selectors
-                compose_selectors = [
-                    (By.CSS_SELECTOR, "a[href='/compose/tweet']"),
-                    (By.CSS_SELECTOR, "a[href='/compose/post']"),
-                    (By.CSS_SELECTOR, "div[aria-label='Post']"),
-                    (By.CSS_SELECTOR, "div[aria-label='Tweet']"),
-                    (By.XPATH, "//span[text()='Post']"),
-                    (By.XPATH, "//span[text()='Tweet']"),
-                    # Additional selectors for the blue compose button
-                    (By.CSS_SELECTOR, "div[data-testid='SideNav_NewTweet_Button']"),
-                    (By.CSS_SELECTOR, "a[data-testid='SideNav_NewTweet_Button']"),
-                    (By.CSS_SELECTOR, "div[aria-label='New post']"),
-                    (By.CSS_SELECTOR, "div[aria-label='New tweet']")
-                ]
-                
+                # The selector that worked last time is tried first and alone
                 compose_button = None
-                for selector_type, selector in compose_selectors:
+                if self._compose_selector:
                     try:
-                        compose_button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((selector_type, selector))
+                        compose_button = WebDriverWait(self.driver, 3).until(
+                            EC.element_to_be_clickable(self._compose_selector)
                         )
-                        logger.info(f"Found compose button using selector: {selector}")
-                        break
-                    except:
-                        continue
+                    except TimeoutException:
+                        logger.info("Cached compose selector no longer matches, trying the others")
+                
+                # Otherwise race all candidates in a single wait
+                if compose_button is None:
+                    try:
+                        selector, compose_button = WebDriverWait(self.driver, 8).until(
+                            _first_clickable(self._COMPOSE_SELECTORS)
+                        )
+                        logger.info(f"Found compose button using selector: {selector[1]}")
+                        self._remember_compose_selector(selector)
+                    except TimeoutException:
+                        pass
                 
                 if compose_button:
                     # Try different click methods
@@ -644,7 +916,7 @@ class TwitterHandler:
                                 compose_button.click()
                             click_success = True
                             break
-                        except:
+                        except WebDriverException:
                             continue
                     
                     if not click_success:
@@ -654,18 +926,21 @@ class TwitterHandler:
                         continue
                     
                     self._add_random_delay()
-                    self._save_debug_info("after_compose_click")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("after_compose_click")
                 else:
                     # Fallback to direct navigation
                     logger.info("Falling back to direct compose navigation...")
                     self.driver.get(f'{self.base_url}/compose/tweet')
                     self._add_random_delay(2.0, 4.0)
-                    self._save_debug_info("direct_compose")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("direct_compose")
                 
                 # Check for automation detection
                 if any(x in self.driver.current_url.lower() for x in ["challenge", "unusual_activity", "verify"]):
                     logger.error("Detected security challenge page")
                     self._save_debug_info("security_challenge")
+                    self._flush_debug_info()
                     return None
 
                 # Wait for compose page to be ready
@@ -673,7 +948,7 @@ class TwitterHandler:
                     WebDriverWait(self.driver, 10).until(
                         lambda x: "compose" in x.current_url.lower()
                     )
-                except:
+                except WebDriverException:
                     logger.error("Failed to load compose page")
                     self._save_debug_info("compose_page_failed")
                     retry_count += 1
@@ -681,26 +956,11 @@ class TwitterHandler:
 
                 try:
                     # Try multiple input selectors
-                    input_selectors = [
-                        (By.CSS_SELECTOR, "div[role='textbox'][contenteditable='true']"),
-                        (By.CSS_SELECTOR, "div[data-testid='tweetTextarea_0']"),
-                        (By.CSS_SELECTOR, "div[aria-label='Post text']"),
-                        (By.CSS_SELECTOR, "div[aria-label='Tweet text']"),
-                        # Additional backup selectors
-                        (By.CSS_SELECTOR, "div.public-DraftEditor-content[contenteditable='true']"),
-                        (By.CSS_SELECTOR, "div[data-contents='true']")
-                    ]
-                    
                     tweet_input = None
-                    for selector_type, selector in input_selectors:
-                        try:
-                            tweet_input = WebDriverWait(self.driver, 5).until(
-                                EC.presence_of_element_located((selector_type, selector))
-                            )
-                            logger.info(f"Found tweet input using selector: {selector}")
-                            break
-                        except:
-                            continue
+                    match = self._probe_selectors(self._INPUT_SELECTORS, 5)
+                    if match:
+                        (_, selector), tweet_input = match
+                        logger.info(f"Found tweet input using selector: {selector}")
                     
                     if not tweet_input:
                         logger.error("Could not find tweet input element")
@@ -715,13 +975,23 @@ class TwitterHandler:
                     self._add_random_delay()
                     
                     # Try different methods to input text
+                    # Typing one character at a time is slow, so it only happens
+                    # when simulate_human_typing is enabled
+                    input_methods = ['direct', 'javascript']
+                    if self.simulate_human_typing:
+                        input_methods.insert(0, 'char_by_char')
+                    
                     input_success = False
-                    for input_method in ['char_by_char', 'javascript', 'direct']:
+                    for input_method in input_methods:
                         try:
                             if input_method == 'char_by_char':
+                                # Keystrokes and pauses go to the driver as one W3C action sequence
+                                action = webdriver.ActionChains(self.driver)
+                                action.click(tweet_input)
                                 for char in content:
-                                    tweet_input.send_keys(char)
-                                    self._add_random_delay(0.01, 0.05)
+                                    action.send_keys(char)
+                                    action.pause(random.uniform(0.01, 0.05))
+                                action.perform()
                             elif input_method == 'javascript':
                                 self.driver.execute_script(
                                     "arguments[0].innerHTML = arguments[1];",
@@ -737,7 +1007,7 @@ class TwitterHandler:
                                 tweet_input.send_keys(content)
                             input_success = True
                             break
-                        except:
+                        except WebDriverException:
                             continue
                     
                     if not input_success:
@@ -747,10 +1017,13 @@ class TwitterHandler:
                         continue
                     
                     self._add_random_delay()
-                    self._save_debug_info("after_input")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("after_input")
                     
                     # Verify content was entered
-                    actual_content = tweet_input.text or tweet_input.get_attribute('innerHTML')
+                    actual_content = self.driver.execute_script(
+                        "return arguments[0].innerText || arguments[0].innerHTML;", tweet_input
+                    )
                     if not actual_content:
                         logger.error("Failed to input content")
                         self._save_debug_info("input_failed")
@@ -758,28 +1031,11 @@ class TwitterHandler:
                         continue
                     
                     # Try multiple post button selectors
-                    post_selectors = [
-                        (By.CSS_SELECTOR, "div[data-testid='tweetButtonInline']"),
-                        (By.CSS_SELECTOR, "div[data-testid='postButtonInline']"),
-                        (By.XPATH, "//span[text()='Post']"),
-                        (By.XPATH, "//span[text()='Tweet']"),
-                        # Additional backup selectors
-                        (By.CSS_SELECTOR, "div[data-testid='tweetButton']"),
-                        (By.CSS_SELECTOR, "div[data-testid='postButton']"),
-                        (By.CSS_SELECTOR, "div[role='button'][data-testid*='tweet']"),
-                        (By.CSS_SELECTOR, "div[role='button'][data-testid*='post']")
-                    ]
-                    
                     post_button = None
-                    for selector_type, selector in post_selectors:
-                        try:
-                            post_button = WebDriverWait(self.driver, 5).until(
-                                EC.element_to_be_clickable((selector_type, selector))
-                            )
-                            logger.info(f"Found post button using selector: {selector}")
-                            break
-                        except:
-                            continue
+                    match = self._probe_selectors(self._POST_SELECTORS, 5, clickable=True)
+                    if match:
+                        (_, selector), post_button = match
+                        logger.info(f"Found post button using selector: {selector}")
                     
                     if not post_button:
                         logger.error("Could not find post button")
@@ -803,7 +1059,7 @@ class TwitterHandler:
                                 post_button.click()
                             click_success = True
                             break
-                        except:
+                        except WebDriverException:
                             continue
                     
                     if not click_success:
@@ -814,7 +1070,8 @@ class TwitterHandler:
                     
                     # Wait for post to complete
                     self._add_random_delay(3.0, 5.0)
-                    self._save_debug_info("after_post")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        self._save_debug_info("after_post")
                     
                     # Try to get tweet ID
                     tweet_id = self._extract_tweet_id()
@@ -831,20 +1088,26 @@ class TwitterHandler:
                     self._save_debug_info("timeout_error")
                     retry_count += 1
                     continue
-                except Exception as e:
+                except WebDriverException as e:
                     logger.error(f"Error during tweet posting: {str(e)}")
                     self._save_debug_info("posting_error")
                     retry_count += 1
                     continue
 
-            except Exception as e:
+            except WebDriverException as e:
                 logger.error(f"Failed to post tweet: {str(e)}")
                 if hasattr(self, 'driver'):
                     self._save_debug_info("fatal_error")
                 retry_count += 1
                 continue
+            except Exception as e:
+                # Not a browser failure, so retrying would only fail the same way
+                logger.error(f"Failed to post tweet: {str(e)}", exc_info=True)
+                self._flush_debug_info()
+                return None
         
         logger.error(f"Failed to post tweet after {max_retries} attempts")
+        self._flush_debug_info()
         return None
 
     def _extract_tweet_id(self) -> Optional[str]:
@@ -853,35 +1116,31 @@ class TwitterHandler:
             logger.info("Attempting to extract tweet ID...")
             
             # Try multiple methods to find the tweet ID
-            methods = [
-                (By.CSS_SELECTOR, "a[href*='/status/']"),
-                (By.CSS_SELECTOR, "a[href*='/posts/']"),
-                (By.CSS_SELECTOR, "div[data-testid='tweet']"),
-                (By.CSS_SELECTOR, "article[data-testid='tweet']"),
-                (By.CSS_SELECTOR, "div[data-testid='post']"),
-                (By.CSS_SELECTOR, "article[data-testid='post']")
-            ]
-            
-            for selector_type, selector in methods:
+            match = self._probe_selectors(self._TWEET_ID_SELECTORS, 10)
+            if match:
+                (selector_type, selector), element = match
+                logger.info(f"Found tweet element using selector: {selector}")
                 try:
-                    logger.info(f"Trying selector: {selector}")
-                    element = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((selector_type, selector))
-                    )
-                    
                     if selector_type == By.CSS_SELECTOR and ("status" in selector or "posts" in selector):
                         href = element.get_attribute('href')
                         tweet_id = href.split('/')[-1]
                         logger.info(f"Found tweet ID from href: {tweet_id}")
                         return tweet_id
                     else:
-                        for attr in ['data-tweet-id', 'data-post-id', 'id']:
-                            tweet_id = element.get_attribute(attr)
-                            if tweet_id:
-                                logger.info(f"Found tweet ID from attribute {attr}: {tweet_id}")
-                                return tweet_id
-                except:
-                    continue
+                        # First non-empty ID attribute, read in one round trip
+                        found = self.driver.execute_script(
+                            "for (const attr of arguments[1]) {"
+                            " const value = arguments[0].getAttribute(attr);"
+                            " if (value) return [attr, value]; }"
+                            " return null;",
+                            element, ['data-tweet-id', 'data-post-id', 'id']
+                        )
+                        if found:
+                            attr, tweet_id = found
+                            logger.info(f"Found tweet ID from attribute {attr}: {tweet_id}")
+                            return tweet_id
+                except (WebDriverException, AttributeError):  # AttributeError: no href
+                    pass
             
             # If we still don't have an ID, try to get it from the URL
             try:
@@ -890,7 +1149,7 @@ class TwitterHandler:
                     tweet_id = current_url.split('/')[-1]
                     logger.info(f"Found tweet ID from URL: {tweet_id}")
                     return tweet_id
-            except:
+            except WebDriverException:
                 pass
             
             logger.error("Could not find tweet ID using any method")
@@ -909,49 +1168,44 @@ class TwitterHandler:
             # Navigate to profile page to see our tweets
             username = os.getenv('TWITTER_USERNAME')
             self.driver.get(f'https://twitter.com/{username}')
-            time.sleep(5)  # Wait for page to load
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-testid='tweet']"))
+                )
+            except TimeoutException:
+                logger.info("No tweets rendered on the profile page")
+                return []
 
-            tweets = []
+            # Keyed by tweet ID: articles stay in the DOM as the page scrolls
+            tweets = {}
             last_height = self.driver.execute_script("return document.body.scrollHeight")
             
             while len(tweets) < limit:
-                # Find all tweet elements
-                tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, "article[data-testid='tweet']")
-                
-                for element in tweet_elements:
-                    try:
-                        # Get tweet text
-                        text_element = element.find_element(By.CSS_SELECTOR, "div[data-testid='tweetText']")
-                        content = text_element.text
-                        
-                        # Get tweet ID from the article's aria-labelledby attribute
-                        tweet_id = element.get_attribute('aria-labelledby').split()[0]
-                        
-                        tweets.append({
-                            'tweet_id': tweet_id,
-                            'content': content,
+                # Read every rendered tweet's ID and text in one round trip
+                for item in self.driver.execute_script(_EXTRACT_TWEETS_JS):
+                    if item['id'] and item['id'] not in tweets:
+                        tweets[item['id']] = {
+                            'tweet_id': item['id'],
+                            'content': item['content'],
                             'username': username
-                        })
-                        
-                        if len(tweets) >= limit:
-                            break
-                            
-                    except NoSuchElementException:
-                        continue
+                        }
                 
                 if len(tweets) >= limit:
                     break
                     
-                # Scroll down
+                # Scroll down and wait for more content to extend the page
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
                 
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                def page_grew(driver, previous=last_height):
+                    height = driver.execute_script("return document.body.scrollHeight")
+                    return height if height != previous else False
+                
+                try:
+                    last_height = WebDriverWait(self.driver, 5).until(page_grew)
+                except TimeoutException:
                     break
-                last_height = new_height
 
-            return tweets[:limit]
+            return list(tweets.values())[:limit]
 
         except Exception as e:
             logger.error(f"Error getting timeline: {str(e)}")
@@ -980,33 +1234,7 @@ class TwitterHandler:
                 dry_run_id = f"dry_run_reply_{datetime.now().timestamp()}"
                 
                 # Store in database for testing
-                conn = init_db_connection(self.db_path)
-                try:
-                    c = conn.cursor()
-                    c.execute('''INSERT INTO tweet_interactions 
-                                (tweet_id, interaction_type, username, personality_id, personality_context, timestamp)
-                                VALUES (?, ?, ?, ?, ?, ?)''',
-                             (tweet_id, 'reply', os.getenv('TWITTER_USERNAME'),
-                              tweet.personality_id,
-                              json.dumps(tweet.personality_context) if tweet.personality_context else None,
-                              datetime.now()))
-                    
-                    if tweet.personality_id:
-                        # Update personality stats
-                        c.execute('''INSERT INTO personality_stats 
-                                    (personality_id, total_replies, last_reply_time)
-                                    VALUES (?, 1, ?)
-                                    ON CONFLICT(personality_id) 
-                                    DO UPDATE SET 
-                                        total_replies = total_replies + 1,
-                                        last_reply_time = ?''',
-                                 (tweet.personality_id, datetime.now(), datetime.now()))
-                    
-                    conn.commit()
-                finally:
-                    conn.close()
-                
-                self.last_reply_time = datetime.now()
+                self._record_reply(tweet_id, tweet)
                 return dry_run_id
 
             # Navigate to tweet
@@ -1027,7 +1255,9 @@ class TwitterHandler:
             reply_input.send_keys(tweet.content)
             
             # Click reply button
-            reply_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='tweetButton']")
+            reply_button = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='tweetButton']"))
+            )
             reply_button.click()
             
             # Wait for reply to be posted and get its ID
@@ -1038,34 +1268,7 @@ class TwitterHandler:
                 reply_id = reply_element.get_attribute('data-tweet-id')
                 
                 if reply_id:
-                    # Store in database
-                    conn = init_db_connection(self.db_path)
-                    try:
-                        c = conn.cursor()
-                        c.execute('''INSERT INTO tweet_interactions 
-                                    (tweet_id, interaction_type, username, personality_id, personality_context, timestamp)
-                                    VALUES (?, ?, ?, ?, ?, ?)''',
-                                 (tweet_id, 'reply', os.getenv('TWITTER_USERNAME'),
-                                  tweet.personality_id,
-                                  json.dumps(tweet.personality_context) if tweet.personality_context else None,
-                                  datetime.now()))
-                        
-                        if tweet.personality_id:
-                            # Update personality stats
-                            c.execute('''INSERT INTO personality_stats 
-                                        (personality_id, total_replies, last_reply_time)
-                                        VALUES (?, 1, ?)
-                                        ON CONFLICT(personality_id) 
-                                        DO UPDATE SET 
-                                            total_replies = total_replies + 1,
-                                            last_reply_time = ?''',
-                                     (tweet.personality_id, datetime.now(), datetime.now()))
-                        
-                        conn.commit()
-                    finally:
-                        conn.close()
-                    
-                    self.last_reply_time = datetime.now()
+                    self._record_reply(tweet_id, tweet)
                     logger.info(f"Successfully replied to tweet {tweet_id}")
                     return reply_id
             except TimeoutException:
@@ -1076,11 +1279,26 @@ class TwitterHandler:
             logger.error(f"Failed to reply to tweet: {str(e)}")
             return None
 
+    def _record_reply(self, tweet_id: str, tweet: Tweet):
+        """Store a reply and bump its personality's stats in one transaction"""
+        now = datetime.now()
+        context = json.dumps(tweet.personality_context) if tweet.personality_context else None
+        
+        # Commits on success, rolls back if either statement fails
+        with self._db_lock, self._db:
+            begin_immediate(self._db)
+            self._db.execute(self._SQL_INSERT_INTERACTION,
+                             (tweet_id, 'reply', os.getenv('TWITTER_USERNAME'),
+                              tweet.personality_id, context, now))
+            if tweet.personality_id:
+                self._db.execute(self._SQL_BUMP_REPLY_STATS, (tweet.personality_id, now))
+        
+        self.last_reply_time = now
+
     def get_stats(self) -> Dict:
         """Get Twitter statistics"""
-        conn = init_db_connection(self.db_path)
-        try:
-            c = conn.cursor()
+        with self._db_lock:
+            c = self._db.cursor()
             
             # Get overall stats
             c.execute('SELECT COUNT(*) FROM tweets')
@@ -1097,31 +1315,80 @@ class TwitterHandler:
                 'total_replies': total_replies,
                 'last_activity': last_activity
             }
-        finally:
-            conn.close()
+
+    def close(self):
+        """Quit the browser session and close the database; safe to call more than once"""
+        db = getattr(self, '_db', None)
+        if db is not None:
+            self._db = None
+            db.close()
+        
+        driver = getattr(self, 'driver', None)
+        if driver is None:
+            return
+        self.driver = None
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser session: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
 
     def __del__(self):
         """Cleanup resources"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        self.close()
 
-    def generate_tweet_content(self, personality: Dict, context: Optional[str] = None) -> Optional[str]:
-        """Generate tweet content based on personality"""
-        try:
-            base_prompt = self.personality_manager.get_personality_prompt(personality, 'twitter', is_reply=False)
-            enhanced_prompt = f"""
+    def _prompt_parts(self, personality: Dict, mode: str) -> Tuple[str, str]:
+        """Static (prefix, suffix) of the tweet ('post') or reply ('chat') prompt.
+
+        Built once per personality and mode; rebuilt when the personality
+        manager hands out a different base prompt after a reload.
+        """
+        base_prompt = self.personality_manager.get_personality_prompt(personality, 'twitter', is_reply=(mode == 'chat'))
+        key = (personality['name'], mode)
+        cached = self._prompt_cache.get(key)
+        if cached is not None and cached[0] is base_prompt:
+            return cached[1]
+        
+        reminder = f"""
+Remember:
+- You are {personality['name']}, {personality['bio'][0]}
+- Draw from your specific knowledge in: {', '.join(personality['knowledge'][:3])}
+- Maintain your characteristic style: {personality['_style_' + mode]}
+- Keep it under 280 characters
+"""
+        if mode == 'post':
+            prefix = f"""
 {base_prompt}
 
 Write a concise, engaging tweet that reflects your unique perspective and expertise.
 Focus on one clear idea and express it naturally within Twitter's 280 character limit.
 Write conversationally while maintaining your professional voice.
+{reminder}"""
+            suffix = ''
+        else:
+            prefix = f"""
+{base_prompt}
 
-Remember:
-- You are {personality['name']}, {personality['bio'][0]}
-- Draw from your specific knowledge in: {', '.join(personality['knowledge'][:3])}
-- Maintain your characteristic style: {', '.join(personality['style']['post'])}
-- Keep it under 280 characters
+As {personality['name']}, engage thoughtfully with this tweet from your unique perspective.
+Write a concise, natural reply that adds value to the discussion while staying within Twitter's 280 character limit.
+
+The tweet you're responding to:
 """
+            suffix = f"\n{reminder}"
+        
+        self._prompt_cache[key] = (base_prompt, (prefix, suffix))
+        return prefix, suffix
+
+    def generate_tweet_content(self, personality: Dict, context: Optional[str] = None) -> Optional[str]:
+        """Generate tweet content based on personality"""
+        try:
+            enhanced_prompt, _ = self._prompt_parts(personality, 'post')
             if context:
                 enhanced_prompt += f"\nContext to respond to:\n{context}"
 
@@ -1134,23 +1401,8 @@ Remember:
     def generate_reply_content(self, personality: Dict, tweet_content: str) -> Optional[str]:
         """Generate reply content based on personality"""
         try:
-            base_prompt = self.personality_manager.get_personality_prompt(personality, 'twitter', is_reply=True)
-            enhanced_prompt = f"""
-{base_prompt}
-
-As {personality['name']}, engage thoughtfully with this tweet from your unique perspective.
-Write a concise, natural reply that adds value to the discussion while staying within Twitter's 280 character limit.
-
-The tweet you're responding to:
-{tweet_content}
-
-Remember:
-- You are {personality['name']}, {personality['bio'][0]}
-- Draw from your specific knowledge in: {', '.join(personality['knowledge'][:3])}
-- Maintain your characteristic style: {', '.join(personality['style']['chat'])}
-- Keep it under 280 characters
-"""
-            content = get_openai_response(enhanced_prompt)
+            prefix, suffix = self._prompt_parts(personality, 'chat')
+            content = get_openai_response(prefix + tweet_content + suffix)
             return content[:280] if content else None
         except Exception as e:
             logger.error(f"Error generating reply content: {str(e)}")
@@ -0,0 +1,91 @@
+import unittest
+import os
+import fcntl
+import signal
+import tempfile
+import threading
+import time
+from unittest import mock
+
+class HangingHandler:
+    """Twitter handler whose close() blocks like a frozen chromedriver"""
+    def __init__(self):
+        self.closing = threading.Event()
+        self.release = threading.Event()
+        self.released = False
+
+    def close(self):
+        self.closing.set()
+        # Only the forced exit releases it; otherwise close() gives up after a while
+        self.released = self.release.wait(5)
+
+class TestContinuousTwitterBot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Import the bot from a temporary directory so its log file lands there"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(cls.tmp_dir.name)
+        try:
+            global continuous_twitter_bot
+            import continuous_twitter_bot
+        finally:
+            os.chdir(cwd)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory"""
+        cls.tmp_dir.cleanup()
+
+    def _make_bot(self, handler):
+        """Build a bot that parks until its next tweet, without config or PID file"""
+        bot = continuous_twitter_bot.ContinuousTwitterBot.__new__(continuous_twitter_bot.ContinuousTwitterBot)
+        bot._stop = threading.Event()
+        bot._shutdown_count = 0
+        bot._wake_event = None
+        bot._reload_requested = False
+        bot.twitter_handler = handler
+        bot.tweets_per_hour = 1
+        bot.min_delay = 60
+        bot.min_interval = bot.max_interval = 3600
+        bot._next_tweet_deadline = time.monotonic() + 3600
+        bot.save_status = lambda: None
+        return bot
+
+    def test_pid_lock_waits_out_a_status_probe(self):
+        """Test that a shared lock held briefly by manage_bot does not stop the bot starting"""
+        bot = continuous_twitter_bot.ContinuousTwitterBot.__new__(continuous_twitter_bot.ContinuousTwitterBot)
+        bot.pid_file = os.path.join(self.tmp_dir.name, 'bot.pid')
+        probe_fd = os.open(bot.pid_file, os.O_RDONLY | os.O_CREAT, 0o644)
+        fcntl.flock(probe_fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        threading.Timer(0.03, os.close, (probe_fd,)).start()
+        try:
+            bot._acquire_pid_file()
+            with open(bot.pid_file) as f:
+                self.assertEqual(f.read(), str(os.getpid()))
+        finally:
+            bot._release_pid_file()
+
+    def test_second_signal_exits_while_close_hangs(self):
+        """Test that a second SIGINT exits while cleanup is stuck in handler.close()"""
+        handler = HangingHandler()
+        bot = self._make_bot(handler)
+
+        def send_signals():
+            time.sleep(0.2)
+            os.kill(os.getpid(), signal.SIGINT)
+            if handler.closing.wait(5):
+                os.kill(os.getpid(), signal.SIGINT)
+
+        sender = threading.Thread(target=send_signals)
+        with mock.patch.object(continuous_twitter_bot.os, '_exit',
+                               side_effect=lambda code: handler.release.set()) as exit_mock:
+            sender.start()
+            bot.run()
+            sender.join()
+
+        self.assertTrue(handler.released)
+        exit_mock.assert_called_once_with(130)
+
+if __name__ == '__main__':
+    unittest.main()
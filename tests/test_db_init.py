@@ -0,0 +1,59 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+
+from utils.db_init import initialize_database
+
+class TestDbInit(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary database path"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'test.db')
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        self.tmp_dir.cleanup()
+
+    def _columns(self, table):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+        finally:
+            conn.close()
+
+    def test_creates_personalities_table(self):
+        """Test that comments reference the personalities table"""
+        initialize_database(self.db_path)
+        self.assertEqual(self._columns('personalities'), ['id', 'name', 'style_json'])
+        self.assertIn('personality_fk', self._columns('comments'))
+
+    def test_recent_posts_scan_uses_index(self):
+        """Test that the newest-posts-first scan is served by idx_posts_platform_ts"""
+        initialize_database(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            plan = conn.execute('''EXPLAIN QUERY PLAN
+                                   SELECT post_id FROM posts WHERE platform = 'reddit'
+                                   ORDER BY timestamp DESC LIMIT 10''').fetchall()
+        finally:
+            conn.close()
+        self.assertIn('idx_posts_platform_ts', ' '.join(row[-1] for row in plan))
+
+    def test_adds_personality_fk_to_existing_comments(self):
+        """Test that an older comments table gains the personality_fk column"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''CREATE TABLE comments
+                        (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                         platform TEXT,
+                         comment_id TEXT UNIQUE,
+                         post_id TEXT,
+                         personality_context TEXT)''')
+        conn.commit()
+        conn.close()
+
+        initialize_database(self.db_path)
+        self.assertIn('personality_fk', self._columns('comments'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import tempfile
+
+from utils.db_utils import init_db_connection, begin_immediate
+
+class TestDbUtils(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary database path"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'test.db')
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        self.tmp_dir.cleanup()
+
+    def test_file_database_uses_wal(self):
+        """Test that file-backed connections are switched to WAL"""
+        conn = init_db_connection(self.db_path)
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            # synchronous is per-connection; 1 is NORMAL
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -64000)
+            self.assertEqual(conn.execute("PRAGMA journal_size_limit").fetchone()[0], 6144000)
+        finally:
+            conn.close()
+
+    def test_memory_database_skips_pragmas(self):
+        """Test that in-memory connections keep the memory journal"""
+        conn = init_db_connection(':memory:')
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'memory')
+        finally:
+            conn.close()
+
+    def test_begin_immediate_opens_one_transaction(self):
+        """Test that writes outside begin_immediate autocommit and inside it wait for commit"""
+        conn = init_db_connection(self.db_path)
+        try:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            self.assertFalse(conn.in_transaction)
+
+            begin_immediate(conn)
+            begin_immediate(conn)  # no-op while a transaction is open
+            conn.execute("INSERT INTO t VALUES (1)")
+            self.assertTrue(conn.in_transaction)
+            conn.rollback()
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -184,8 +184,19 @@ class TestMultiPlatformIntegration(unittest.TestCase):
         self.assertIsNotNone(result, "Session not found")
         self.assertFalse(result[0], "Session should be inactive")
 
+    def test_cleanup_respects_timeout(self):
+        """Test that only sessions idle past the timeout are deactivated"""
+        self.eliza_handler.create_session("test_user")
+        
+        # A fresh session is not idle for an hour yet
+        self.assertEqual(self.eliza_handler.cleanup_inactive_sessions(timeout_seconds=3600), 0)
+        
+        # With no grace period it is cleaned up
+        self.assertEqual(self.eliza_handler.cleanup_inactive_sessions(timeout_seconds=0), 1)
+
     def tearDown(self):
         """Clean up test environment"""
+        self.eliza_handler.close()
         self.conn.close()
         if os.path.exists(self.db_path):
             os.remove(self.db_path)
@@ -0,0 +1,50 @@
+import unittest
+import os
+import json
+import tempfile
+
+from utils import json_utils
+
+class TestJsonUtils(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary JSON file"""
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        with open(self.path, 'w') as f:
+            json.dump({'value': 1}, f)
+
+    def tearDown(self):
+        """Remove the temporary JSON file"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_load_json_reuses_cached_value(self):
+        """Test that an unchanged file is only decoded once"""
+        first = json_utils.load_json(self.path)
+        second = json_utils.load_json(self.path)
+        self.assertEqual(first, {'value': 1})
+        self.assertIs(first, second, "Unchanged file should be served from cache")
+
+    def test_load_json_invalidates_on_mtime_change(self):
+        """Test that a modified file is decoded again"""
+        json_utils.load_json(self.path)
+        with open(self.path, 'w') as f:
+            json.dump({'value': 2}, f)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(json_utils.load_json(self.path), {'value': 2})
+
+    def test_write_json_skips_identical_payload(self):
+        """Test that rewriting the same payload is skipped"""
+        self.assertTrue(json_utils.write_json(self.path, {'value': 3}))
+        self.assertFalse(json_utils.write_json(self.path, {'value': 3}))
+        self.assertTrue(json_utils.write_json(self.path, {'value': 4}))
+        self.assertEqual(json_utils.load_json(self.path), {'value': 4})
+
+    def test_dumps_is_compact(self):
+        """Test that dumps produces the same compact bytes with or without orjson"""
+        self.assertEqual(json_utils.dumps({'name': 'bé', 'style': ['a', 'b']}),
+                         '{"name":"bé","style":["a","b"]}'.encode('utf-8'))
+
+if __name__ == '__main__':
+    unittest.main()
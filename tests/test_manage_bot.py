@@ -0,0 +1,51 @@
+import unittest
+import os
+import fcntl
+import tempfile
+from unittest import mock
+
+import manage_bot
+
+class TestManageBot(unittest.TestCase):
+    def setUp(self):
+        """Point manage_bot at a temporary PID file"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pid_file = os.path.join(self.tmp_dir.name, 'bot.pid')
+        patcher = mock.patch.object(manage_bot, 'PID_FILE', self.pid_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove the temporary PID file"""
+        self.tmp_dir.cleanup()
+
+    def _lock_pid_file(self, content: str) -> int:
+        """Hold the PID file the way a bot does, with the given content"""
+        fd = os.open(self.pid_file, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        os.write(fd, content.encode())
+        self.addCleanup(os.close, fd)
+        return fd
+
+    def test_missing_or_unlocked_file_is_not_running(self):
+        """Test that no PID file, or a stale unlocked one, means no bot"""
+        self.assertEqual(manage_bot.read_pid_file(), (False, None))
+        with open(self.pid_file, 'w') as f:
+            f.write(str(os.getpid()))
+        self.assertIsNone(manage_bot.get_bot_pid())
+        self.assertFalse(manage_bot.is_bot_starting())
+
+    def test_locked_file_reports_pid(self):
+        """Test that a locked file with a live PID reports that PID"""
+        self._lock_pid_file(str(os.getpid()))
+        self.assertEqual(manage_bot.get_bot_pid(), os.getpid())
+        self.assertFalse(manage_bot.is_bot_starting())
+
+    def test_locked_empty_file_is_starting(self):
+        """Test that a bot which has locked the file but not written its PID is starting"""
+        self._lock_pid_file('')
+        self.assertIsNone(manage_bot.get_bot_pid())
+        self.assertTrue(manage_bot.is_bot_starting())
+
+if __name__ == '__main__':
+    unittest.main()
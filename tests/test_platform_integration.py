@@ -126,6 +126,7 @@ class TestPlatformIntegration(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up test environment"""
+        cls.eliza_handler.close()
         if os.path.exists(cls.db_path):
             os.remove(cls.db_path)
 
@@ -35,7 +35,7 @@ def initialize_database(db_path: str = "bot.db", force_recreate: bool = False):
         # Drop existing tables if force_recreate is True
         if force_recreate:
             logger.info("Dropping existing tables")
-            tables = ['platform_stats', 'posts', 'comments', 'personality_stats']
+            tables = ['platform_stats', 'posts', 'comments', 'personalities', 'personality_stats']
             for table in tables:
                 c.execute(f"DROP TABLE IF EXISTS {table}")
                 logger.info(f"Dropped table: {table}")
@@ -72,6 +72,19 @@ def initialize_database(db_path: str = "bot.db", force_recreate: bool = False):
         logger.info("Created posts table")
         verify_table_schema(c, 'posts')
         
+        # Serves the newest-posts-first scan in get_recent_activity
+        c.execute('CREATE INDEX IF NOT EXISTS idx_posts_platform_ts ON posts(platform, timestamp DESC)')
+        logger.info("Created posts platform/timestamp index")
+        
+        # Create personalities table; comments reference it instead of
+        # repeating the personality context as JSON on every row
+        c.execute('''CREATE TABLE IF NOT EXISTS personalities
+                    (id INTEGER PRIMARY KEY,
+                     name TEXT UNIQUE,
+                     style_json BLOB)''')
+        logger.info("Created personalities table")
+        verify_table_schema(c, 'personalities')
+        
         # Create comments table
         c.execute('''CREATE TABLE IF NOT EXISTS comments
                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -82,11 +95,20 @@ def initialize_database(db_path: str = "bot.db", force_recreate: bool = False):
                      comment_content TEXT,
                      personality_id TEXT,
                      personality_context TEXT,
+                     personality_fk INTEGER,
                      timestamp DATETIME,
                      FOREIGN KEY(post_id) REFERENCES posts(post_id),
+                     FOREIGN KEY(personality_fk) REFERENCES personalities(id),
                      UNIQUE(platform, comment_id))''')
         logger.info("Created comments table")
-        verify_table_schema(c, 'comments')
+        if 'personality_fk' not in verify_table_schema(c, 'comments'):
+            c.execute('ALTER TABLE comments ADD COLUMN personality_fk INTEGER REFERENCES personalities(id)')
+            logger.info("Added personality_fk column to comments table")
+        
+        # Index the comments side of the posts/comments join in get_recent_activity;
+        # posts.post_id is already indexed by its UNIQUE constraint
+        c.execute('CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id)')
+        logger.info("Created comments post_id index")
         
         # Create personality stats table
         c.execute('''CREATE TABLE IF NOT EXISTS personality_stats
@@ -2,6 +2,23 @@ import sqlite3
 from datetime import datetime
 from typing import Any
 
+# Per-connection prepared statement cache size (sqlite3 defaults to 128)
+CACHED_STATEMENTS = 256
+
+# Per-connection settings: WAL lets readers proceed alongside a writer, and
+# synchronous=NORMAL is durable under WAL with one fsync per checkpoint rather
+# than per commit. journal_size_limit truncates the WAL back to ~6MB after
+# checkpoints; a negative cache_size is in KiB
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA journal_size_limit=6144000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
 def adapt_datetime(dt: datetime) -> str:
     """Adapt datetime to SQL format"""
     return dt.isoformat()
@@ -13,8 +30,34 @@ def convert_datetime(val: str) -> datetime:
     except (ValueError, TypeError):
         return None
 
-def init_db_connection(db_path: str) -> sqlite3.Connection:
-    """Initialize database connection with proper adapters"""
+def init_db_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Initialize database connection with proper adapters and WAL pragmas.
+
+    The connection is in autocommit mode: statements outside a transaction
+    commit on their own, and write paths open one with begin_immediate.
+    """
     sqlite3.register_adapter(datetime, adapt_datetime)
     sqlite3.register_converter("datetime", convert_datetime)
-    return sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES) 
\ No newline at end of file
+    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES,
+                           check_same_thread=check_same_thread, isolation_level=None,
+                           cached_statements=CACHED_STATEMENTS)
+    # In-memory databases cannot use WAL or mmap
+    if db_path not in (':memory:', '') and not db_path.startswith('file::memory:'):
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+def begin_immediate(conn: sqlite3.Connection):
+    """Start a write transaction unless one is already open.
+
+    BEGIN IMMEDIATE takes the write lock up front, waiting up to busy_timeout
+    for other writers, instead of failing with SQLITE_BUSY when a deferred
+    transaction tries to upgrade from a read. End it with conn.commit() or
+    conn.rollback().
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+def optimize_db(conn: sqlite3.Connection):
+    """Let SQLite refresh query planner statistics if it judges them stale"""
+    conn.execute("PRAGMA optimize")
@@ -4,15 +4,18 @@ import praw
 import sqlite3
 import os
 import time
+import random
+import atexit
+import threading
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from datetime import datetime, timedelta
 from typing import List, Dict
 from utils.constant import openAI_generate
+from utils.db_utils import init_db_connection
+from utils.openai_utils import get_openai_client
 
 load_dotenv()
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def load_accounts(filepath="accounts.json") -> List[Dict[str, str]]:
@@ -47,6 +50,10 @@ def get_reddit_instance():
         logger.error(f"Error authenticating with Reddit: {str(e)}", exc_info=True)
         return None
 
+def _backoff_delay(base: float, attempt: int, ceiling: float) -> float:
+    """Exponential backoff capped at ceiling, plus up to 1s of jitter"""
+    return min(ceiling, base * (2 ** attempt)) + random.uniform(0, 1)
+
 def get_openai_response(prompt: str) -> str:
     """Get response from OpenAI with retry logic"""
     max_retries = 3
@@ -54,8 +61,7 @@ def get_openai_response(prompt: str) -> str:
     
     for attempt in range(max_retries):
         try:
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            response = client.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a Reddit user creating engaging content. Keep responses concise and natural."},
@@ -68,15 +74,21 @@ def get_openai_response(prompt: str) -> str:
         except Exception as e:
             logger.error(f"OpenAI API error (attempt {attempt + 1}/{max_retries}): {str(e)}", exc_info=True)
             if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+                time.sleep(_backoff_delay(retry_delay, attempt, 60))
             else:
                 raise
 
+# Subreddits already confirmed to exist; each needs only one about fetch
+_VALID_SUBREDDITS = set()
+
 def is_valid_subreddit(reddit: praw.Reddit, subreddit_name: str) -> bool:
     """Check if subreddit exists and is accessible"""
+    if subreddit_name in _VALID_SUBREDDITS:
+        return True
     try:
         subreddit = reddit.subreddit(subreddit_name)
         _ = subreddit.id  # This will fail if subreddit doesn't exist
+        _VALID_SUBREDDITS.add(subreddit_name)
         return True
     except Exception as e:
         logger.error(f"Error checking subreddit {subreddit_name}: {str(e)}", exc_info=True)
@@ -111,35 +123,61 @@ def get_random_post():
                 "timestamp": post[2],
             }
         else:
-            print("WARNING - No eligible post found for commenting.")
+            logger.warning("No eligible post found for commenting.")
             return None
         
     except sqlite3.OperationalError as e:
-        print(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         return None
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return None
 
+# One connection per thread for save_post/save_comment, closed at exit
+_SAVE_DB_PATH = 'reddit_bot.db'
+_tls = threading.local()
+_save_conns = []
+_save_conns_lock = threading.Lock()
+
+def _save_conn() -> sqlite3.Connection:
+    """Get the calling thread's connection, opening it on first use"""
+    conn = getattr(_tls, 'conn', None)
+    if conn is None:
+        # Only this thread uses it; check_same_thread=False lets atexit close it
+        conn = _tls.conn = init_db_connection(_SAVE_DB_PATH, check_same_thread=False)
+        with _save_conns_lock:
+            _save_conns.append(conn)
+    return conn
+
+@atexit.register
+def _close_save_conns():
+    with _save_conns_lock:
+        for conn in _save_conns:
+            conn.close()
+        _save_conns.clear()
+
 def save_post(post_id, username, subreddit, title):
     timestamp = datetime.now()
-    conn = sqlite3.connect('reddit_bot.db')
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO posts (post_id, username, subreddit, post_title, timestamp) VALUES (?, ?, ?, ?, ?)", (post_id, username, subreddit, title, timestamp))
-    conn.commit()
+    # Autocommit connection: the single INSERT commits on its own
+    _save_conn().execute("INSERT INTO posts (post_id, username, subreddit, post_title, timestamp) VALUES (?, ?, ?, ?, ?)", (post_id, username, subreddit, title, timestamp))
     
-    print(f"Post created by {username}: {post_id} at {timestamp}")
+    logger.info("Post created by %s: %s at %s", username, post_id, timestamp)
 
 def save_comment(username, comment_id, post_id):
     timestamp = datetime.now()
-    conn = sqlite3.connect('reddit_bot.db')
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO comments (username, comment_id, post_id, timestamp) VALUES (?, ?, ?, ?)", (username, comment_id, post_id, timestamp))
-    conn.commit()
+    _save_conn().execute("INSERT INTO comments (username, comment_id, post_id, timestamp) VALUES (?, ?, ?, ?)", (username, comment_id, post_id, timestamp))
     
-    print(f"Comment created by {username}: {comment_id} at {timestamp}")
+    logger.info("Comment created by %s: %s at %s", username, comment_id, timestamp)
+
+# Link flair templates per subreddit: name -> (fetched_at monotonic, flairs)
+_FLAIR_CACHE = {}
+FLAIR_CACHE_TTL = 3600
 
 def get_flairs(reddit, subreddit_name):
+    """Get a subreddit's link flairs, reusing a fetch for FLAIR_CACHE_TTL seconds"""
+    cached = _FLAIR_CACHE.get(subreddit_name)
+    if cached and time.monotonic() - cached[0] < FLAIR_CACHE_TTL:
+        return cached[1]
     try:
         subreddit = reddit.subreddit(subreddit_name)
         flair_templates = subreddit.flair.link_templates
@@ -147,9 +185,10 @@ def get_flairs(reddit, subreddit_name):
             {"flair_id": flair["id"], "flair_text": flair["text"]}
             for flair in flair_templates
         ]
+        _FLAIR_CACHE[subreddit_name] = (time.monotonic(), flairs)
         return flairs
     except Exception as e:
-        print(f"Error fetching flairs for subreddit '{subreddit_name}': {e}")
+        logger.error("Error fetching flairs for subreddit '%s': %s", subreddit_name, e)
         return []
 
 def handle_rate_limit(func):
@@ -163,8 +202,8 @@ def handle_rate_limit(func):
                 return func(*args, **kwargs)
             except praw.exceptions.RedditAPIException as e:
                 if "RATELIMIT" in str(e):
-                    wait_time = retry_delay * (attempt + 1)
-                    logger.warning(f"Rate limited. Waiting {wait_time} seconds before retry...")
+                    wait_time = _backoff_delay(retry_delay, attempt, 600)
+                    logger.warning(f"Rate limited. Waiting {wait_time:.0f} seconds before retry...")
                     time.sleep(wait_time)
                 else:
                     raise
@@ -0,0 +1,70 @@
+"""JSON file utilities with mtime-based caching"""
+
+import os
+import json
+from typing import Any, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decoded documents keyed by absolute path: (st_mtime_ns, data)
+_json_cache: Dict[str, Tuple[int, Any]] = {}
+# Last payload written per absolute path, used to skip identical rewrites
+_last_written: Dict[str, bytes] = {}
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    # Match orjson's output: no whitespace, non-ASCII kept as UTF-8
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or text, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, reusing the decoded value while its mtime is unchanged.
+
+    The returned object is shared between callers and must not be mutated.
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        data = loads(f.read())
+    _json_cache[path] = (mtime, data)
+    return data
+
+def write_json(path: str, data: Any) -> bool:
+    """Atomically write data as JSON unless the payload matches the last write.
+
+    The payload is written and fsynced to a temporary file that is then
+    renamed over the target, so readers never see a truncated file.
+
+    Returns:
+        bool: True if the file was written, False if the write was skipped
+    """
+    path = os.path.abspath(path)
+    payload = dumps(data)
+    if _last_written.get(path) == payload and os.path.exists(path):
+        return False
+
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    _last_written[path] = payload
+    _json_cache[path] = (os.stat(path).st_mtime_ns, data)
+    return True
@@ -0,0 +1,46 @@
+"""Logging setup shared by the bot entrypoints"""
+
+import atexit
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+def configure_logging(log_file: str, level: int = logging.INFO,
+                      max_bytes: int = 50 * 1024 * 1024, backup_count: int = 3) -> None:
+    """Route root logging through a queue drained by a background listener.
+
+    Logging calls only enqueue the record; a QueueListener thread writes it
+    to stderr and to a log file rotated once it reaches max_bytes, keeping
+    backup_count old files. Only the first call takes effect, so an
+    entrypoint module imported by another one does not install a second
+    listener. Handlers left on the root logger by import-time basicConfig
+    calls are replaced.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -2,15 +2,29 @@
 
 import os
 import logging
+import threading
 from openai import OpenAI
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared client; its HTTP connection pool is thread-safe and reused across calls
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+def get_openai_client() -> OpenAI:
+    """Return the shared OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
+
 def get_openai_response(prompt: str) -> Optional[str]:
     """Get a response from OpenAI"""
     try:
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        client = get_openai_client()
         if not client.api_key:
             logger.error("OpenAI API key not found")
             return None
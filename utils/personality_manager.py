@@ -1,11 +1,15 @@
 import json
 import os
 import random
+import threading
 from typing import Dict, List, Optional
 
 class PersonalityManager:
     def __init__(self):
         self.personalities = {}
+        self._prompt_cache = {}  # (name, platform, is_reply) -> base prompt
+        self._by_platform = {}  # platform -> personalities supporting it
+        self._local = threading.local()  # per-thread random.Random
         self.config = self.load_config()
         self.load_personalities()
         self.conversation_threads = {}  # Keep track of which personality owns which thread
@@ -68,15 +72,47 @@ class PersonalityManager:
                                 platform_config = self.config['platforms'][platform]
                                 if 'target_subreddits' in platform_config:
                                     settings['subreddits'] = platform_config['target_subreddits']
+                    self._precompute_prompt_fields(personality)
                     self.personalities[personality['name']] = personality
 
+    def reload(self):
+        """Reload config and personality profiles, dropping cached prompts"""
+        self.personalities = {}
+        self._prompt_cache.clear()
+        self._by_platform.clear()
+        self.config = self.load_config()
+        self.load_personalities()
+
+    def _personalities_for(self, platform: str) -> List[Dict]:
+        """Personalities that support the platform, computed once per platform"""
+        valid_personalities = self._by_platform.get(platform)
+        if valid_personalities is None:
+            valid_personalities = self._by_platform[platform] = [
+                p for p in self.personalities.values()
+                if 'platform_settings' in p and platform in p['platform_settings']
+            ]
+        return valid_personalities
+
+    @staticmethod
+    def _precompute_prompt_fields(personality: Dict):
+        """Store the joined trait strings that prompt templates interpolate"""
+        if 'knowledge' in personality:
+            personality['_knowledge_head'] = ', '.join(personality['knowledge'][:3])
+        personality['_style_chat'] = ', '.join(personality['style']['chat'])
+        personality['_style_post'] = ', '.join(personality['style']['post'])
+
+    @property
+    def _rng(self) -> random.Random:
+        """Per-thread generator, so bot threads don't share the global random lock"""
+        rng = getattr(self._local, 'rng', None)
+        if rng is None:
+            rng = self._local.rng = random.Random()
+        return rng
+
     def get_random_personality(self, platform: str = 'reddit') -> Dict:
         """Get a random personality that supports the specified platform"""
-        valid_personalities = [
-            p for p in self.personalities.values()
-            if 'platform_settings' in p and platform in p['platform_settings']
-        ]
-        return random.choice(valid_personalities) if valid_personalities else None
+        valid_personalities = self._personalities_for(platform)
+        return self._rng.choice(valid_personalities) if valid_personalities else None
 
     def get_personality(self, name: str) -> Optional[Dict]:
         """Get a specific personality by name"""
@@ -98,15 +134,24 @@ class PersonalityManager:
     def get_contrasting_personality(self, current_personality: str, platform: str = 'reddit') -> Dict:
         """Get a different personality to create interaction"""
         valid_personalities = [
-            p for name, p in self.personalities.items()
-            if name != current_personality
-            and 'platform_settings' in p
-            and platform in p['platform_settings']
+            p for p in self._personalities_for(platform)
+            if p['name'] != current_personality
         ]
-        return random.choice(valid_personalities) if valid_personalities else self.personalities[current_personality]
+        return self._rng.choice(valid_personalities) if valid_personalities else self.personalities[current_personality]
 
     def get_personality_prompt(self, personality: Dict, platform: str, is_reply: bool = False) -> str:
-        """Generate a prompt based on personality traits and platform settings"""
+        """Generate a prompt based on personality traits and platform settings.
+
+        Prompts only depend on the (static) personality profile, so each one is
+        built once and cached.
+        """
+        key = (personality['name'], platform, is_reply)
+        prompt = self._prompt_cache.get(key)
+        if prompt is None:
+            prompt = self._prompt_cache[key] = self._build_personality_prompt(personality, platform, is_reply)
+        return prompt
+
+    def _build_personality_prompt(self, personality: Dict, platform: str, is_reply: bool) -> str:
         prompt = f"You are {personality['name']}. "
         prompt += " ".join(personality['bio'])
         
@@ -138,7 +183,7 @@ class PersonalityManager:
         if platform in self.config['platforms']:
             platform_config = self.config['platforms'][platform]
             if 'personality' in platform_config:
-                return random.random() < platform_config['personality']['settings'].get('reply_probability', 0.7)
+                return self._rng.random() < platform_config['personality']['settings'].get('reply_probability', 0.7)
         return False
 
     def get_platform_settings(self, platform: str) -> Dict: